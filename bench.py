@@ -0,0 +1,336 @@
+"""
+Benchmark of the bot search, run without any window.
+
+Usage: python bench.py [--depth DEPTH] [--time SECONDS] [--nodes NODES] [--hash MB]
+                       [--workers WORKERS] [--speedup] [--memory]
+                       [--batch POSITIONS] [--packing POSITIONS] [--fen FEN]
+                       [--no-null-move] [--no-lmr] [--profile DIRECTORY]
+                       [--profile-mode {sample,cprofile}] [--profile-memory]
+"""
+import tracemalloc
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+
+from board import Board
+from engine.batch import (
+    encode_positions,
+    encode_planes,
+    evaluate_batch,
+    pack_batch,
+    unpack_batch,
+)
+from engine.fen import parse_fen, to_fen
+from engine.packing import PACKED_SIZE, pack_positions, unpack_positions
+from engine.position import square_of
+from engine.utils import calculate_total_score, enemy_color
+from profiling import Profiler, add_profile_arguments, profiler_from_arguments
+
+# Number of repetitions of each board operation
+OPERATIONS_REPEAT = 1000
+
+
+def bench_operations():
+    """
+    Measure the cost of the board operations used by the search, on the initial position
+    """
+    board = Board(None, 8, 8, 0)
+    operations = {
+        "clone_grid": lambda: board.clone_grid(),
+        "get_color_all_moves": lambda: board.get_color_all_moves("white"),
+        "calculate_total_score": lambda: calculate_total_score(board.grid),
+    }
+
+    stats = {}
+    for (name, operation) in operations.items():
+        start = perf_counter()
+        for _ in range(OPERATIONS_REPEAT):
+            operation()
+        stats[f"{name} (us)"] = (perf_counter() - start) / OPERATIONS_REPEAT * 1e6
+
+    # Memory held by a cloned grid, which is allocated for every node of the search.
+    tracemalloc.start()
+    clones = [board.clone_grid() for _ in range(OPERATIONS_REPEAT)]
+    stats["clone_grid (bytes)"] = tracemalloc.get_traced_memory()[0] // len(clones)
+    tracemalloc.stop()
+
+    return stats
+
+
+def bench_search(
+    depth: int,
+    time_limit=None,
+    node_limit=None,
+    hash_size_mb: int = 16,
+    memory: bool = False,
+    workers: int = 1,
+    fen=None,
+    null_move_pruning: bool = True,
+    late_move_reductions: bool = True,
+    profiler: Profiler = None,
+):
+    """
+    Run a search from the initial position, or the given one, and return its statistics
+    """
+    board = Board(None, 8, 8, 0)
+    (grid, color) = (board.grid, "black")
+    if fen:
+        (grid, color) = parse_fen(fen)
+    board.bot.depth = depth
+    board.bot.time_limit = time_limit
+    board.bot.node_limit = node_limit
+    board.bot.set_hash_size(hash_size_mb)
+    board.bot.null_move_pruning = null_move_pruning
+    board.bot.late_move_reductions = late_move_reductions
+    if workers > 1:
+        board.bot.set_workers(workers)
+        # Wait for the helper processes to be started, out of the measure.
+        board.bot.depth = 1
+        board.bot.play(color, grid)
+        board.bot.depth = depth
+        board.bot.tt.clear()
+
+    if profiler:
+        profiler.wrap(board.bot, "play", "play", ends_move=True)
+    if memory:
+        tracemalloc.start()
+
+    start = perf_counter()
+    move = board.bot.play(color, grid)
+    elapsed = perf_counter() - start
+    board.bot.close()
+
+    nodes = board.bot.nodes + sum(board.bot.helper_nodes)
+    stats = {
+        "depth": depth,
+        "completed depth": board.bot.completed_depth,
+        "move": move,
+        "pv": board.bot.pv,
+        "workers": workers,
+        "nodes": board.bot.nodes,
+        "quiescence nodes": board.bot.quiescence_nodes,
+        "helper nodes": board.bot.helper_nodes,
+        "time (s)": elapsed,
+        "nodes/s": nodes / elapsed if elapsed else 0,
+        "effective branching": board.bot.effective_branching_factor,
+        "beta cutoffs": board.bot.cutoffs,
+        "first move cutoffs": board.bot.first_move_cutoff_rate,
+        "null move cutoffs": board.bot.null_move_cutoffs,
+        "reductions": board.bot.reductions,
+        "researches": board.bot.researches,
+        "aspiration failures": board.bot.aspiration_failures,
+        "tt probes": board.bot.tt.probes,
+        "tt hits": board.bot.tt.hits,
+        "tt hit rate": board.bot.tt.hit_rate,
+        "tt usage": board.bot.tt.usage(),
+        "legality checks": board.bot.legality_checks,
+    }
+
+    if memory:
+        stats["peak memory (bytes)"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return stats
+
+
+def bench_speedup(depth: int, max_workers: int, hash_size_mb: int = 16):
+    """
+    Measure the time to search the initial position at the given depth,
+    with 1 to max_workers processes, and the speedup compared to a single one
+    """
+    stats = {}
+    single = None
+    for workers in range(1, max_workers + 1):
+        search_stats = bench_search(depth, hash_size_mb=hash_size_mb, workers=workers)
+        elapsed = search_stats["time (s)"]
+        if single is None:
+            single = elapsed
+        stats[f"{workers} workers"] = (
+            f"{elapsed:.3f}s, {search_stats['nodes/s']:.0f} nodes/s, "
+            f"speedup {single / elapsed:.2f}"
+        )
+    return stats
+
+
+def random_positions(count: int, seed: int = 0):
+    """
+    Return positions reached by playing random moves from the initial position
+    """
+    board = Board(None, 8, 8, 0)
+    rng = Random(seed)
+    positions = []
+    grid = board.grid.copy()
+    color = "white"
+    while len(positions) < count:
+        moves = board.filter_illegal_moves(
+            board.get_color_all_moves(color, grid), color, grid
+        )
+        if not moves or len(grid) <= 2:
+            (grid, color) = (board.grid.copy(), "white")
+            continue
+        (s, e) = rng.choice(sorted(moves))
+        grid.make_move(square_of(s[0], s[1]), square_of(e[0], e[1]))
+        color = enemy_color(color)
+        positions.append(grid.copy())
+    return positions
+
+
+def bench_batch(count: int):
+    """
+    Evaluate random positions one by one and all at once, verify that the scores
+    are the same, and return the time taken by each way
+    """
+    positions = random_positions(count)
+
+    start = perf_counter()
+    expected = [calculate_total_score(grid) for grid in positions]
+    single = perf_counter() - start
+
+    start = perf_counter()
+    codes = encode_positions(positions)
+    encoding = perf_counter() - start
+    start = perf_counter()
+    scores = evaluate_batch(codes)
+    batch = perf_counter() - start
+    planes = encode_planes(codes)
+    start = perf_counter()
+    plane_scores = evaluate_batch(planes)
+    batch_planes = perf_counter() - start
+
+    assert list(scores) == expected, "batched scores mismatch"
+    assert list(plane_scores) == expected, "batched plane scores mismatch"
+    return {
+        "positions": count,
+        "calculate_total_score (s)": single,
+        "encode_positions (s)": encoding,
+        "evaluate_batch codes (s)": batch,
+        "evaluate_batch planes (s)": batch_planes,
+    }
+
+
+def bench_packing(count: int):
+    """
+    Pack random positions in 32 bytes each and unpack them, verify that they are
+    the same after the round trip (and after one through FEN), and return the time
+    taken. The bulk versions with NumPy are measured too when it is installed.
+    """
+    positions = random_positions(count)
+    colors = ["white" if index % 2 else "black" for index in range(count)]
+    pairs = list(zip(positions, colors))
+
+    start = perf_counter()
+    data = pack_positions(pairs)
+    packing = perf_counter() - start
+    start = perf_counter()
+    unpacked = unpack_positions(data)
+    unpacking = perf_counter() - start
+
+    assert len(data) == count * PACKED_SIZE, "packed size mismatch"
+    for ((grid, color), (expected, expected_color)) in zip(unpacked, pairs):
+        assert grid == expected and color == expected_color, "unpacked mismatch"
+        assert grid.key == expected.key, "unpacked key mismatch"
+        fen = to_fen(grid, color)
+        assert parse_fen(fen) == (expected, expected_color), "FEN mismatch"
+        assert to_fen(*parse_fen(fen)) == fen, "FEN round trip mismatch"
+
+    stats = {
+        "positions": count,
+        "bytes": len(data),
+        "pack_positions (s)": packing,
+        "unpack_positions (s)": unpacking,
+    }
+    try:
+        codes = encode_positions(positions)
+    except ImportError:
+        return stats
+
+    start = perf_counter()
+    batch_data = pack_batch(codes, colors)
+    stats["pack_batch (s)"] = perf_counter() - start
+    start = perf_counter()
+    (batch_codes, black) = unpack_batch(batch_data)
+    stats["unpack_batch (s)"] = perf_counter() - start
+
+    assert batch_data == data, "batched packing mismatch"
+    assert (batch_codes == codes).all(), "batched unpacking mismatch"
+    assert list(black) == [color == "black" for color in colors], "colors mismatch"
+    return stats
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the bot search.")
+    parser.add_argument("--depth", type=int, default=3, help="maximum depth")
+    parser.add_argument("--time", type=float, help="time budget in seconds")
+    parser.add_argument("--nodes", type=int, help="node budget")
+    parser.add_argument(
+        "--hash", type=int, default=16, help="size of the transposition table in MB"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes searching in parallel",
+    )
+    parser.add_argument(
+        "--speedup",
+        action="store_true",
+        help="compare the search time with 1 to WORKERS processes instead",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace the memory allocations of the search (slower)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        metavar="POSITIONS",
+        help="compare the batched evaluation (needs NumPy) with the single one instead",
+    )
+    parser.add_argument(
+        "--packing",
+        type=int,
+        metavar="POSITIONS",
+        help="verify and time the 32 bytes encoding of the positions instead",
+    )
+    parser.add_argument("--fen", help="position to search instead of the initial one")
+    parser.add_argument(
+        "--no-null-move", action="store_true", help="disable the null-move pruning"
+    )
+    parser.add_argument(
+        "--no-lmr", action="store_true", help="disable the late move reductions"
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.batch:
+        print(bench_batch(args.batch))
+        return
+
+    if args.packing:
+        print(bench_packing(args.packing))
+        return
+
+    if args.speedup:
+        search_stats = bench_speedup(args.depth, args.workers, args.hash)
+    else:
+        search_stats = bench_search(
+            args.depth,
+            args.time,
+            args.nodes,
+            args.hash,
+            args.memory,
+            args.workers,
+            args.fen,
+            not args.no_null_move,
+            not args.no_lmr,
+            profiler_from_arguments(args),
+        )
+    for stats in (bench_operations(), search_stats):
+        for (name, value) in stats.items():
+            print(f"{name:>24}: {value}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,33 @@
-from time import time
+from os import path
+from queue import Queue, Empty
+from threading import Thread, Event as StopEvent
+from traceback import print_exc
 from tkinter import Event, Canvas, messagebox
-from collections import defaultdict
-from bot import Bot
-from piece import Pawn, Knight, Rook, Bishop, Queen, King, Piece
-from utils import enemy_color
-from typing import Tuple, DefaultDict, Optional, Set
+from consts import BOOK_PATH, BOT_LEVELS, BOT_MAX_DEPTH, TABLEBASE_PATH
+from engine.book import OpeningBook
+from engine.bot import Bot
+from engine.fen import parse_fen, to_fen
+from engine.piece import Pawn, Knight, Rook, Bishop, Queen, King, Piece
+from engine.movegen import generate_moves, legal_moves, is_in_check
+from engine.position import Position, square_of, position_of, square_name
+from engine.stats import SearchStats
+from engine.tablebase import Tablebases
+from engine.utils import enemy_color
+from images import piece_image
+from typing import Dict, List, Tuple, Optional, Set
+
+DARK_SQUARE_COLOR = "#B88B4A"
+LIGHT_SQUARE_COLOR = "#E3C16F"
+MOVE_HINT_COLOR = "#d4e157"
+CAPTURE_HINT_COLOR = "#ef5350"
 
 
 class Board:
     w: int
     h: int
     cellSize: int
-    grid: DefaultDict[Tuple[int, int], Optional[Piece]]
-    canvas: Canvas
+    grid: Position
+    canvas: Optional[Canvas]
     hoverPosition: Optional[Tuple[int, int]]
     currentMousePosition: Optional[Tuple[int, int]]
     draggedPiece: Optional[Piece]
@@ -20,13 +35,23 @@ class Board:
     last_x: int
     last_y: int
 
+    # Interval in milliseconds between two checks of the bot search progress
+    BOT_POLL_INTERVAL = 50
+
     def __init__(self, canvas, width: int, height: int, cell_size: int):
         self.w = width
         self.h = height
         self.cellSize = cell_size
-        # Generate the grid using a defaultdict structure, which is a dict, that default non-existing value to None.
-        self.grid = defaultdict(lambda: None)
+        # Generate the grid using a Position, which stores a piece code for each of the 64 squares.
+        self.grid = Position()
+        # The canvas can be None to use the board without any window (e.g. benchmarks).
         self.canvas = canvas
+        # Items drawn on the canvas, kept between renders: the cells of the grid,
+        # the pieces and hints by position (with what they show), and the dragged piece.
+        self.square_items: List[int] = []
+        self.piece_items: Dict[Tuple[int, int], Tuple[int, Piece]] = {}
+        self.hint_items: Dict[Tuple[int, int], Tuple[int, str]] = {}
+        self.drag_item: Optional[int] = None
 
         # Store the currently hovered piece
         self.hoverPosition = None
@@ -35,36 +60,49 @@ class Board:
         self.player = "white"
 
         # Store an instance of the bot class
-        # If you make the bot using more than 3 in depth, it will start to be slow!
-
-        # Choose between 1-5
-        self.bot = Bot(self, 3)
+        # The bot searches deeper and deeper until its time budget is exhausted.
+        self.bot = Bot(self, BOT_MAX_DEPTH, time_limit=BOT_LEVELS[3])
+        # The book and the tablebases are next to the game, wherever it is run from.
+        book_path = path.join(path.dirname(path.abspath(__file__)), BOOK_PATH)
+        if path.exists(book_path):
+            self.bot.book = OpeningBook(book_path)
+        tablebase_path = path.join(path.dirname(path.abspath(__file__)), TABLEBASE_PATH)
+        if path.isdir(tablebase_path):
+            self.bot.tablebases = Tablebases(tablebase_path)
 
         # Store the choice of user, playing against a bot or another player
         self.playWithBot = True
 
-        # Store the currently dragged piece and it's position
+        # Store the currently dragged piece and it's position, and where it can be dropped
         self.currentMousePosition = None
         self.draggedPiece = None
         self.draggedPosition = None
+        self.draggedTargets = set()
+
+        # Legal moves of the player, and the key of the position they were computed for
+        self.legal_move_map = {}
+        self.legal_move_key = None
 
         self.last_x = -1
         self.last_y = -1
 
+        # The bot searches in a worker thread, which sends its progress through
+        # the queue, so the window stays responsive while it thinks.
+        self.search_thread = None
+        self.search_queue = Queue()
+        self.search_stop = None
+        self.poll_job = None
+        self.title = None
+
         self.reset_board()
 
-    def clone_grid(self, grid=None) -> DefaultDict[Tuple[int, int], Optional[Piece]]:
+    def clone_grid(self, grid=None) -> Position:
         """
         Clone a grid into a new one
         """
         if not grid:
             grid = self.grid
-        new_grid = defaultdict(lambda: None)
-
-        for (pos, val) in grid.items():
-            if val:
-                new_grid[pos] = val.clone()
-        return new_grid
+        return grid.copy()
 
     def get_color_all_moves(
         self, color: str, grid=None
@@ -72,82 +110,33 @@ class Board:
         if grid is None:
             grid = self.grid
 
-        # Use set since you don't want to check multiple moves more than once.
-        res = set()
-
-        for (x, y), piece in grid.copy().items():
-            if piece and piece.color == color:
-                capture_moves = piece.get_capture_moves(self, grid, x, y)
-                moves = piece.get_moves(self, grid, x, y)
-
-                for pos in capture_moves:
-                    (pos_x, pos_y) = pos
-                    target = self.get_piece_at_position(pos_x, pos_y, grid)
-                    if target and target.color != piece.color:
-                        res.add(((x, y), pos))
-
-                for pos in moves:
-                    (pos_x, pos_y) = pos
-                    if self.is_position_in_bound(
-                        pos_x, pos_y
-                    ) and not self.check_piece_at_position(pos_x, pos_y, grid):
-                        res.add(((x, y), pos))
-
-        return res
-
-    def is_capture_move(self, move, grid):
-        if not grid:
-            grid = self.grid
-
-        (_, e) = move
-        return type(self.get_piece_at_position(e[0], e[1], grid)) is King
+        # The moves are generated on the squares of the grid, convert them to positions.
+        return {
+            (position_of(start), position_of(end))
+            for (start, end) in generate_moves(grid, color)
+        }
 
     def filter_illegal_moves(
-        self, moves: Set[Tuple[Tuple[int, int], Tuple[int, int]]], color: str
+        self,
+        moves: Set[Tuple[Tuple[int, int], Tuple[int, int]]],
+        color: str,
+        grid=None,
     ):
         """
         Remove all illegal moves from the given moves.
         """
-        is_under_check = self.is_color_in_check(color)
-
-        if not is_under_check:
-            return moves
-        else:
-            new = set()
-            for (p1, p2) in moves:
-                tmp = self.clone_grid()
-                tmp[p2] = tmp[p1]
-                tmp.pop(p1)
-                if not self.is_color_in_check(color, tmp):
-                    new.add((p1, p2))
-
-            return new
-
-    def get_king_piece(self, color: str, grid=None):
-        """
-        Return the king piece of the given color
-        """
-        if not grid:
+        if grid is None:
             grid = self.grid
 
-        # Check if the king is not actually dragged.
-        if type(self.draggedPiece) is King:
-            (x, y) = self.convert_world_to_local(
-                self.hoverPosition[0], self.hoverPosition[1]
-            )
-            return (x, y), self.draggedPiece
+        new = set()
+        for (p1, p2) in moves:
+            # Play the move on the grid itself, and revert it once verified.
+            undo = grid.make_move(square_of(p1[0], p1[1]), square_of(p2[0], p2[1]))
+            if not self.is_color_in_check(color, grid):
+                new.add((p1, p2))
+            grid.unmake_move(undo)
 
-        # Search for the king over the whole grid.
-        for ((x, y), piece) in grid.items():
-            if piece and piece.color == color and type(piece) is King:
-                return (x, y), piece
-
-        self.render()
-        messagebox.showerror(
-            "Warning",
-            f"The {color} king was captured.\n{enemy_color(color)} won.\n\nThe game has been reset.",
-        )
-        self.reset_board()
+        return new
 
     def is_color_in_check(self, color: str, grid=None):
         """
@@ -156,37 +145,29 @@ class Board:
         if not grid:
             grid = self.grid
 
-        moves = self.get_color_all_moves(enemy_color(color), grid)
+        return is_in_check(grid, color)
 
-        # And check if the king position is included in the movements of the enemy.
-        for move in moves:
-            if self.is_capture_move(move, grid):
-                return True
-
-        return False
-
-    def emulate_check(self, p1: Tuple[int, int], p2: Tuple[int, int], player: str):
+    def get_legal_move_map(self) -> Dict[Tuple[int, int], Set[Tuple[int, int]]]:
         """
-        Simulate a movement, and verify if it provokes a check for the player.
+        Return the positions each piece of the player can legally move to,
+        by the position of the piece.
+        The map is computed once per position, and reused until the grid changes.
         """
-        tmp = self.clone_grid()
-        if tmp[p1]:
-            tmp[p2] = tmp[p1]
-            tmp.pop(p1)
-            return self.is_color_in_check(player, tmp)
-        elif self.draggedPiece:
-            tmp[p2] = self.draggedPiece.clone()
-            tmp.pop(p1)
-            return self.is_color_in_check(player, tmp)
-        else:
-            return False
+        key = self.grid.hash_key(self.player)
+        if key != self.legal_move_key:
+            self.legal_move_map = {}
+            for (start, end) in legal_moves(self.grid, self.player):
+                self.legal_move_map.setdefault(position_of(start), set()).add(
+                    position_of(end)
+                )
+            self.legal_move_key = key
+        return self.legal_move_map
 
     def verify_counter_check(self, color: str):
-        # Test all the possible movements, to verify if the check goes away
-        return any(
-            not self.emulate_check(p1, p2, color)
-            for p1, p2 in self.get_color_all_moves(color)
-        )
+        # Verify if any of the movements makes the check go away
+        if color == self.player:
+            return bool(self.get_legal_move_map())
+        return bool(legal_moves(self.grid, color))
 
     def verify_for_checkmate(self):
         # If the white player is in check, verify if the player has a way to avoid the check.
@@ -207,99 +188,123 @@ class Board:
 
         return None
 
-    def draw_movements(self, movements, capture_movements, color: str):
+    def get_hints(self) -> Dict[Tuple[int, int], str]:
         """
-        Draw all the movement on the board.
+        Return the color of the hint to show on each cell the hovered
+        or dragged piece can move to
         """
-        if color == self.player:
-            for pos in movements:
-                (x, y) = pos
-
-                # Draw a hollow on cell that doesn't have a piece
-                if not self.check_piece_at_position(x, y):
-                    self.canvas.create_rectangle(
-                        x * self.cellSize + self.cellSize * 0.2,
-                        y * self.cellSize + self.cellSize * 0.2,
-                        x * self.cellSize + self.cellSize * 0.8,
-                        y * self.cellSize + self.cellSize * 0.8,
-                        fill="#d4e157",
-                        outline="",
-                    )
+        if self.draggedPiece:
+            targets = self.draggedTargets
+        elif self.hoverPosition:
+            # Only the pieces of the player have legal moves in the map.
+            targets = self.get_legal_move_map().get(self.hoverPosition, ())
+        else:
+            return {}
 
-            for pos in capture_movements:
-                (x, y) = pos
-
-                # Draw a hollow on cell that doesn't have a piece
-                capture_piece = self.get_piece_at_position(x, y)
-                if capture_piece and capture_piece.color != color:
-                    self.canvas.create_rectangle(
-                        x * self.cellSize + self.cellSize * 0.2,
-                        y * self.cellSize + self.cellSize * 0.2,
-                        x * self.cellSize + self.cellSize * 0.8,
-                        y * self.cellSize + self.cellSize * 0.8,
-                        fill="#ef5350",
-                        outline="",
-                    )
+        # The capture hints are on the enemy pieces, the other ones on empty cells.
+        return {
+            (x, y): CAPTURE_HINT_COLOR if self.grid[x, y] else MOVE_HINT_COLOR
+            for (x, y) in targets
+        }
 
     def render(self):
         """
-        Render the board
+        Render the board.
+
+        The items of the canvas are kept between renders, only the ones that changed
+        since the previous render are created, updated or deleted.
         """
 
-        # Clear existing canvas, as we will redraw everything.
-        self.canvas.delete("all")
+        # Nothing to draw on when the board runs without a window.
+        if self.canvas is None:
+            return
 
-        # Draw the grid
+        # Draw the grid, once
+        if not self.square_items:
+            for y in range(self.h):
+                for x in range(self.w):
+                    self.square_items.append(
+                        self.canvas.create_rectangle(
+                            x * self.cellSize,
+                            y * self.cellSize,
+                            x * self.cellSize + self.cellSize,
+                            y * self.cellSize + self.cellSize,
+                            fill=DARK_SQUARE_COLOR
+                            if (y - x) % 2 == 0
+                            else LIGHT_SQUARE_COLOR,
+                            outline="",
+                            tags="square",
+                        )
+                    )
+
+        # Update the pieces that changed
         for y in range(self.h):
             for x in range(self.w):
-                if (y - x) % 2 == 0:
-                    fill = "#B88B4A"
+                piece = self.grid[x, y]
+                (item, shown) = self.piece_items.get((x, y), (None, None))
+                if piece is shown:
+                    continue
+                if piece is None:
+                    self.canvas.delete(item)
+                    del self.piece_items[x, y]
+                elif item is None:
+                    item = self.canvas.create_image(
+                        x * self.cellSize + self.cellSize // 2,
+                        y * self.cellSize + self.cellSize // 2,
+                        image=piece_image(piece, self.cellSize),
+                        tags="piece",
+                    )
+                    self.piece_items[x, y] = (item, piece)
                 else:
-                    fill = "#E3C16F"
-
-                self.canvas.create_rectangle(
-                    x * self.cellSize,
-                    y * self.cellSize,
-                    x * self.cellSize + self.cellSize,
-                    y * self.cellSize + self.cellSize,
+                    self.canvas.itemconfigure(
+                        item, image=piece_image(piece, self.cellSize)
+                    )
+                    self.piece_items[x, y] = (item, piece)
+
+        # Update the hints of the movements, drawn between the grid and the pieces
+        hints = self.get_hints()
+        for position in list(self.hint_items):
+            if position not in hints:
+                self.canvas.delete(self.hint_items.pop(position)[0])
+        for ((x, y), fill) in hints.items():
+            (item, shown) = self.hint_items.get((x, y), (None, None))
+            if fill == shown:
+                continue
+            if item is None:
+                item = self.canvas.create_rectangle(
+                    x * self.cellSize + self.cellSize * 0.2,
+                    y * self.cellSize + self.cellSize * 0.2,
+                    x * self.cellSize + self.cellSize * 0.8,
+                    y * self.cellSize + self.cellSize * 0.8,
                     fill=fill,
                     outline="",
+                    tags="hint",
                 )
+                self.canvas.tag_raise(item, "square")
+            else:
+                self.canvas.itemconfigure(item, fill=fill)
+            self.hint_items[x, y] = (item, fill)
 
-        # Show possible movements if the user hover a piece
-        if self.hoverPosition:
-            (x, y) = self.hoverPosition[0], self.hoverPosition[1]
-            piece = self.get_piece_at_position(x, y)
-            if piece:
-                self.draw_movements(
-                    piece.get_moves(self, self.grid, x, y),
-                    piece.get_capture_moves(self, self.grid, x, y),
-                    piece.color,
-                )
-
-        # Draw all the pieces
-        for ((x, y), piece) in self.grid.items():
-            if self.grid[x, y] is not None:
-                self.canvas.create_image(
-                    x * self.cellSize + self.cellSize // 2,
-                    y * self.cellSize + self.cellSize // 2,
-                    image=self.grid[x, y].image(self.cellSize),
-                )
-
-        # Show the movements of the currently moved piece
+        # Show the currently moved piece on top of everything
         if self.draggedPiece:
-            (x, y) = self.draggedPosition[0], self.draggedPosition[1]
-            self.draw_movements(
-                self.draggedPiece.get_moves(self, self.grid, x, y),
-                self.draggedPiece.get_capture_moves(self, self.grid, x, y),
-                self.draggedPiece.color,
-            )
+            if self.drag_item is None:
+                self.drag_item = self.canvas.create_image(
+                    self.currentMousePosition[0],
+                    self.currentMousePosition[1],
+                    image=piece_image(self.draggedPiece, self.cellSize),
+                )
+            else:
+                self.move_dragged_piece()
+        elif self.drag_item is not None:
+            self.canvas.delete(self.drag_item)
+            self.drag_item = None
 
-            self.canvas.create_image(
-                self.currentMousePosition[0],
-                self.currentMousePosition[1],
-                image=self.draggedPiece.image(self.cellSize),
-            )
+    def move_dragged_piece(self):
+        """
+        Move the dragged piece to the mouse position, nothing else changes during a drag
+        """
+        if self.canvas is not None and self.drag_item is not None:
+            self.canvas.coords(self.drag_item, *self.currentMousePosition)
 
     def convert_world_to_local(self, x: int, y: int) -> Tuple[int, int]:
         """
@@ -337,6 +342,10 @@ class Board:
         """
         Handle click event on the board
         """
+        # The pieces can't be moved while the bot is thinking.
+        if self.is_bot_searching():
+            return
+
         (x, y) = self.convert_world_to_local(button_press.x, button_press.y)
         piece = self.get_piece_at_position(x, y)
         # If there is no piece at the clicked position, ignore the left click
@@ -345,6 +354,9 @@ class Board:
 
         self.draggedPiece = piece
         self.draggedPosition = (x, y)
+        self.currentMousePosition = (button_press.x, button_press.y)
+        # Keep the legal moves of the piece, the grid changes while it is dragged.
+        self.draggedTargets = self.get_legal_move_map().get((x, y), set())
 
         # Remove the piece from the board, so it can be drawn on the mouse position
         self.grid.pop((x, y))
@@ -363,64 +375,44 @@ class Board:
 
             (pos_x, pos_y) = self.draggedPosition[0], self.draggedPosition[1]
 
-            destination_piece = self.get_piece_at_position(x, y)
-            # Check if the released position is a valid movement.
-            if (
-                (x, y) in self.draggedPiece.get_moves(self, self.grid, pos_x, pos_y)
-                and not destination_piece
-            ) or (
-                (x, y)
-                in self.draggedPiece.get_capture_moves(self, self.grid, pos_x, pos_y)
-                and destination_piece
-                and destination_piece.color != self.draggedPiece.color
-            ):
-                if not self.emulate_check((pos_x, pos_y), (x, y), self.player):
-                    # Move the piece to the new position
-                    self.grid[x, y] = self.draggedPiece.clone()
-                    self.draggedPiece = None
-                    self.draggedPosition = None
-                    if self.player == "white":
-                        self.player = "black"
-                    else:
-                        self.player = "white"
-
-                    # After a movement has been made, check if any of the king are under check/checkmate
-                    loser = self.verify_for_checkmate()
-
-                    if not loser and self.player == "black" and self.playWithBot:
-                        start = time()
-                        bot_move = self.bot.play("black", self.grid)
-                        print(f"Bot took {time() - start} seconds to play")
-
-                        if bot_move:
-                            (s, e) = bot_move
-
-                            self.grid[e] = self.grid[s].clone()
-                            self.grid.pop(s)
-                            self.player = "white"
-
-                            # After a movement has been made, check if any of the king are under check/checkmate
-                            loser = self.verify_for_checkmate()
-
-                            if loser:
-                                self.render()
-                                # Update the board instantly, as the game ends
-                                self.canvas.winfo_toplevel().update()
-                        else:
-                            loser = "black"
-
-                    if loser:
-                        messagebox.showinfo(
-                            "Game Ended",
-                            f"{enemy_color(loser)} won!\n{loser} has a checkmate!",
-                        )
-                        self.reset_board()
-                        return
+            # Check if the released position is a legal movement.
+            if (x, y) in self.draggedTargets:
+                # Move the piece to the new position
+                self.grid[x, y] = self.draggedPiece.clone()
+                self.draggedPiece = None
+                self.draggedPosition = None
+                if self.player == "white":
+                    self.player = "black"
                 else:
-                    self.grid[pos_x, pos_y] = self.draggedPiece.clone()
-                    self.draggedPiece = None
-                    self.draggedPosition = None
+                    self.player = "white"
+
+                # After a movement has been made, check if any of the king are under check/checkmate
+                loser = self.verify_for_checkmate()
+
+                if loser:
+                    self.end_game(loser)
+                    return
+
+                if self.player == "black" and self.playWithBot:
+                    # The move of the bot is played once its search is done.
+                    self.start_bot_search()
+            else:
+                # Revert the movement
+                piece = self.draggedPiece
+                self.grid[pos_x, pos_y] = piece.clone()
+                self.draggedPiece = None
+                self.draggedPosition = None
 
+                # Tell the player when the movement is only prevented by the check.
+                destination_piece = self.get_piece_at_position(x, y)
+                if (
+                    (x, y) in piece.get_moves(self, self.grid, pos_x, pos_y)
+                    and not destination_piece
+                ) or (
+                    (x, y) in piece.get_capture_moves(self, self.grid, pos_x, pos_y)
+                    and destination_piece
+                    and destination_piece.color != piece.color
+                ):
                     self.render()
                     self.canvas.winfo_toplevel().update()
 
@@ -428,14 +420,141 @@ class Board:
                         "Illegal Move",
                         "You're king is in check!",
                     )
-            else:
-                # Revert the movement
-                self.grid[pos_x, pos_y] = self.draggedPiece.clone()
-                self.draggedPiece = None
-                self.draggedPosition = None
 
             self.render()
 
+    def end_game(self, loser: str):
+        """
+        Announce the winner, and start a new game
+        """
+        messagebox.showinfo(
+            "Game Ended",
+            f"{enemy_color(loser)} won!\n{loser} has a checkmate!",
+        )
+        self.reset_board()
+
+    def is_bot_searching(self) -> bool:
+        return self.search_thread is not None
+
+    def start_bot_search(self):
+        """
+        Start the search of the bot move in a worker thread
+        """
+        self.cancel_bot_search()
+
+        # The search runs on its own copy of the grid, the board can be rendered meanwhile.
+        self.search_stop = StopEvent()
+        self.search_thread = Thread(
+            target=self.run_bot_search,
+            args=(self.grid.copy(), self.player, self.search_stop),
+            daemon=True,
+        )
+        self.search_thread.start()
+
+        if self.canvas is not None:
+            window = self.canvas.winfo_toplevel()
+            self.title = window.title()
+            window.title(f"{self.title} - Bot thinking...")
+            self.poll_job = self.canvas.after(
+                self.BOT_POLL_INTERVAL, self.poll_bot_search
+            )
+
+    def run_bot_search(self, grid: Position, color: str, stop: StopEvent):
+        """
+        Search the bot move, in the worker thread
+        """
+        def on_iteration(*progress):
+            self.search_queue.put(("progress", progress))
+
+        # A result is always sent, or the board would wait for the bot forever.
+        result = ("error", None)
+        try:
+            bot_move = self.bot.play(color, grid, stop, on_iteration)
+            result = ("done", (bot_move, self.bot.stats))
+        except Exception as error:
+            print_exc()
+            result = ("error", error)
+        finally:
+            self.search_queue.put(result)
+
+    def poll_bot_search(self):
+        """
+        Handle the messages of the worker thread, on the Tk main loop
+        """
+        self.poll_job = None
+        while True:
+            try:
+                (kind, data) = self.search_queue.get_nowait()
+            except Empty:
+                break
+
+            if kind == "progress":
+                (depth, (s, e), _, _) = data
+                move = square_name(square_of(*s)) + square_name(square_of(*e))
+                self.canvas.winfo_toplevel().title(
+                    f"{self.title} - Bot thinking: depth {depth}, best move {move}"
+                )
+            else:
+                self.search_thread.join()
+                self.search_thread = None
+                self.canvas.winfo_toplevel().title(self.title)
+                if kind == "done":
+                    self.apply_bot_move(*data)
+                else:
+                    messagebox.showerror(
+                        "Bot", f"The search of the bot failed:\n{data!r}"
+                    )
+                return
+
+        self.poll_job = self.canvas.after(
+            self.BOT_POLL_INTERVAL, self.poll_bot_search
+        )
+
+    def cancel_bot_search(self):
+        """
+        Stop the search of the bot, if it is running, and ignore its result
+        """
+        if self.search_thread is None:
+            return
+
+        self.search_stop.set()
+        self.search_thread.join()
+        self.search_thread = None
+
+        if self.poll_job is not None:
+            self.canvas.after_cancel(self.poll_job)
+            self.poll_job = None
+        if self.canvas is not None:
+            self.canvas.winfo_toplevel().title(self.title)
+
+        # Drop the messages the search sent before it stopped.
+        while not self.search_queue.empty():
+            self.search_queue.get_nowait()
+
+    def apply_bot_move(self, bot_move, stats: SearchStats):
+        """
+        Play the move found by the bot
+        """
+        print(stats.summary())
+
+        if bot_move:
+            (s, e) = bot_move
+
+            self.grid[e] = self.grid[s].clone()
+            self.grid.pop(s)
+            self.player = enemy_color(self.player)
+
+            # After a movement has been made, check if any of the king are under check/checkmate
+            loser = self.verify_for_checkmate()
+        else:
+            loser = self.player
+
+        self.render()
+        if loser:
+            # Update the board instantly, as the game ends
+            self.canvas.winfo_toplevel().update()
+            self.end_game(loser)
+
     def on_mouse_move(self, motion: Event):
         self.currentMousePosition = (motion.x, motion.y)
 
@@ -443,8 +562,8 @@ class Board:
             # Show the movements on the hovered piece, if no piece is being dragged.
             self.handle_hover(motion)
         else:
-            # If there is a dragged piece, render the moving piece.
-            self.render()
+            # If there is a dragged piece, only move it.
+            self.move_dragged_piece()
 
     def handle_hover(self, motion: Event):
         """
@@ -475,6 +594,9 @@ class Board:
 
         # Reset all the variables to default
 
+        # The position searched by the bot doesn't exist anymore.
+        self.cancel_bot_search()
+
         self.grid.clear()
         self.hoverPosition = None
 
@@ -514,3 +636,39 @@ class Board:
                 self.grid[x, self.h - 1] = King("white")
 
         self.render()
+
+    def to_fen(self) -> str:
+        """
+        Return the FEN string of the board, with the player to move
+        """
+        return to_fen(self.grid, self.player)
+
+    def load_fen(self, fen: str):
+        """
+        Set the board to the position of the FEN string, and give the turn to its
+        color to move. Raise a ValueError if the FEN string isn't valid.
+        """
+        (grid, color) = parse_fen(fen)
+
+        # The position searched by the bot doesn't exist anymore.
+        self.cancel_bot_search()
+
+        self.grid.clear()
+        for (square, code) in enumerate(grid.squares):
+            if code:
+                self.grid.put(square, code)
+
+        self.hoverPosition = None
+        self.currentMousePosition = None
+        self.draggedPiece = None
+        self.draggedPosition = None
+
+        self.last_x = -1
+        self.last_y = -1
+
+        self.player = color
+
+        self.render()
+
+        if self.player == "black" and self.playWithBot:
+            self.start_bot_search()
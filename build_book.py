@@ -0,0 +1,130 @@
+"""
+Build an opening book from a collection of games in the PGN notation.
+
+The first plies of each game are replayed, and each move gets a weight from the
+result of the game for the side that played it: 2 for a win, 1 for a draw (or an
+unknown result) and 0 for a loss. The weights of the same move in the same position
+are summed, and the moves that were never good enough are left out of the book.
+Games using moves of the full rules (castling, promotion, en passant) stop there.
+
+Usage: python build_book.py GAMES [GAMES ...] [--output FILE] [--plies PLIES]
+"""
+import re
+from argparse import ArgumentParser
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+
+from engine.bot import encode_move
+from engine.book import OpeningBook, write_book
+from engine.fen import INITIAL_FEN, parse_fen
+from engine.san import parse_san
+from engine.utils import enemy_color
+
+# Tag pair line, like [Result "1-0"]
+TAG = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+# Comments, numeric annotations, and move numbers of the movetext, then variations
+SKIPPED = re.compile(r"\{[^}]*\}|\$\d+|\d+\.(\.\.)?")
+VARIATION = re.compile(r"\([^()]*\)")
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+# Weight of a move for each result of the game, for the side that played it
+WIN_WEIGHT = 2
+DRAW_WEIGHT = 1
+
+# Number of plies of each game added to the book
+BOOK_PLIES = 20
+
+
+def read_games(path: str) -> Iterator[Tuple[Dict[str, str], List[str]]]:
+    """
+    Yield the tags and the moves in the algebraic notation of each game of the file
+    """
+    tags: Dict[str, str] = {}
+    movetext: List[str] = []
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            match = TAG.match(line)
+            if match:
+                # A tag after the moves starts the next game.
+                if movetext:
+                    yield tags, split_movetext(" ".join(movetext))
+                    (tags, movetext) = ({}, [])
+                tags[match.group(1)] = match.group(2)
+            else:
+                # Comments starting with a semicolon end with the line.
+                line = line.split(";")[0].strip()
+                if line:
+                    movetext.append(line)
+    if tags or movetext:
+        yield tags, split_movetext(" ".join(movetext))
+
+
+def split_movetext(movetext: str) -> List[str]:
+    """
+    Return the moves of the movetext, without the comments and the variations
+    """
+    movetext = SKIPPED.sub(" ", movetext)
+    # Variations can be nested, the innermost ones are removed first.
+    while True:
+        (movetext, count) = VARIATION.subn(" ", movetext)
+        if not count:
+            break
+    return [word for word in movetext.split() if word not in RESULTS]
+
+
+def add_game(
+    weights: Counter, tags: Dict[str, str], sans: List[str], plies: int
+) -> int:
+    """
+    Add the first plies of the game to the weights of the book,
+    and return the number of plies added
+    """
+    (grid, color) = parse_fen(tags.get("FEN", INITIAL_FEN))
+    result = tags.get("Result", "*")
+
+    for (ply, san) in enumerate(sans[:plies]):
+        move = parse_san(grid, color, san)
+        if move is None:
+            return ply
+
+        if result == "1/2-1/2" or result not in RESULTS[:2]:
+            weight = DRAW_WEIGHT
+        elif (result == "1-0") == (color == "white"):
+            weight = WIN_WEIGHT
+        else:
+            weight = 0
+        weights[grid.hash_key(color), encode_move(move)] += weight
+
+        grid.make_move(*move)
+        color = enemy_color(color)
+    return min(len(sans), plies)
+
+
+def main():
+    parser = ArgumentParser(description="Build an opening book from PGN files.")
+    parser.add_argument("games", nargs="+", help="PGN files of the games")
+    parser.add_argument(
+        "-o", "--output", default="book.bin", help="file to write the book to"
+    )
+    parser.add_argument(
+        "--plies", type=int, default=BOOK_PLIES, help="plies of each game in the book"
+    )
+    args = parser.parse_args()
+
+    weights: Counter = Counter()
+    (games, plies) = (0, 0)
+    for path in args.games:
+        for (tags, sans) in read_games(path):
+            plies += add_game(weights, tags, sans, args.plies)
+            games += 1
+
+    write_book(args.output, weights)
+
+    book = OpeningBook(args.output)
+    print(f"{games} games, {plies} plies: {len(book)} entries in {args.output}")
+    book.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Generate the endgame tablebases probed by the bot, in a directory.
+
+The tables are solved by retrograde analysis, the smaller ones first so the
+captures of the bigger ones can use them. KQK and KRK take a few seconds, and KBNK
+a minute or two. Without promotions, KPK is a draw everywhere, but the table lets
+the bot know it instead of searching.
+
+With --verify, random positions of each table are checked against their moves,
+played with the move generation of the engine.
+
+Usage: python build_tablebases.py [TABLES ...] [--directory DIRECTORY]
+                                  [--verify POSITIONS]
+"""
+import os
+import random
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Dict
+
+from consts import TABLEBASE_PATH
+from engine.consts import BLACK_BIT, KING
+from engine.movegen import is_in_check, legal_moves
+from engine.position import Position
+from engine.tablebase import (
+    DEFAULT_TABLES,
+    DRAW,
+    EXTENSION,
+    LOSS,
+    WIN,
+    Table,
+    Tablebases,
+    generate_table,
+    parse_name,
+    write_table,
+)
+from engine.utils import enemy_color
+
+
+def verify_table(tablebases: Tablebases, name: str, positions: int) -> int:
+    """
+    Check the result of random positions of the table against the results after
+    their moves, and return the number of errors
+    """
+    kinds = parse_name(name)
+    errors = 0
+    checked = 0
+    while checked < positions:
+        # The pieces are given to either color, to check the flipped probes too.
+        strong = random.choice(("white", "black"))
+        color = random.choice(("white", "black"))
+        black = BLACK_BIT if strong == "black" else 0
+        squares = random.sample(range(64), len(kinds) + 2)
+        grid = Position()
+        grid.put(squares[0], KING | black)
+        grid.put(squares[1], KING | (black ^ BLACK_BIT))
+        for (kind, square) in zip(kinds, squares[2:]):
+            grid.put(square, kind | black)
+        if is_in_check(grid, enemy_color(color)):
+            continue
+        checked += 1
+
+        wins = []
+        losses = []
+        draw = False
+        for (start, end) in legal_moves(grid, color):
+            undo = grid.make_move(start, end)
+            # The captures leading to positions without a table are draws.
+            (result, plies) = tablebases.probe(grid, enemy_color(color)) or (DRAW, 0)
+            grid.unmake_move(undo)
+            if result == LOSS:
+                wins.append(plies + 1)
+            elif result == WIN:
+                losses.append(plies + 1)
+            else:
+                draw = True
+
+        if wins:
+            expected = (WIN, min(wins))
+        elif draw:
+            expected = (DRAW, 0)
+        elif losses:
+            expected = (LOSS, max(losses))
+        else:
+            expected = (LOSS, 0) if is_in_check(grid, color) else (DRAW, 0)
+
+        found = tablebases.probe(grid, color)
+        if found != expected:
+            errors += 1
+            print(
+                f"  {name}: {sorted(grid.pieces['white'])} "
+                f"{sorted(grid.pieces['black'])} {color} to move, "
+                f"{found} instead of {expected}"
+            )
+    return errors
+
+
+def main():
+    parser = ArgumentParser(description="Generate the endgame tablebases.")
+    parser.add_argument(
+        "tables",
+        nargs="*",
+        default=DEFAULT_TABLES,
+        help="names of the tables, like KQK",
+    )
+    parser.add_argument(
+        "-d",
+        "--directory",
+        default=TABLEBASE_PATH,
+        help="directory to write the tables to",
+    )
+    parser.add_argument(
+        "--verify", type=int, default=0, help="random positions to verify per table"
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    tablebases = Tablebases(args.directory)
+    # Smaller tables first, so the bigger ones can use them for their captures.
+    names = sorted((Table(name).name for name in args.tables), key=len)
+    tables: Dict[str, Table] = {}
+    for name in names:
+        start = perf_counter()
+        table = generate_table(name, tables)
+        tables[name] = table
+        write_table(os.path.join(args.directory, name + EXTENSION), table)
+
+        half = len(table.data) // 2
+        won = sum(1 for value in table.data[:half] if value)
+        lost = sum(1 for value in table.data[half:] if value)
+        longest = max(table.data) - 1
+        print(
+            f"{name}: {won} won and {lost} lost positions, "
+            f"longest mate {longest if longest >= 0 else '-'} plies, "
+            f"{perf_counter() - start:.1f}s"
+        )
+
+        if args.verify:
+            errors = verify_table(tablebases, name, args.verify)
+            print(f"{name}: {args.verify} positions verified, {errors} errors")
+
+    tablebases.close()
+
+
+if __name__ == "__main__":
+    main()
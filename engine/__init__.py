@@ -0,0 +1,13 @@
+"""
+Rules, move generation, evaluation and search of the game, without any interface.
+
+The package doesn't import tkinter, so it can be used on a machine without
+a display, and by the processes of the parallel search.
+"""
+from .bot import Bot
+from .fen import parse_fen, to_fen
+from .movegen import generate_moves, legal_moves, is_in_check
+from .packing import pack_position, unpack_position, pack_positions, unpack_positions
+from .position import Position, square_of, position_of, square_name
+from .transposition import TranspositionTable
+from .utils import enemy_color
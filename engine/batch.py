@@ -0,0 +1,135 @@
+"""
+Evaluation of many positions at once, for the bulk analysis of games.
+
+The positions are encoded as NumPy arrays, either as vectors of the 64 piece codes
+or as planes with one 8x8 board per piece, and evaluated with gathers from the
+stacked square tables. The scores are the same as calculate_total_score: the tables
+only hold multiples of 0.5, so the sums are exact whatever their order.
+The 32 bytes positions of packing.py can be packed and unpacked in bulk too.
+
+NumPy is optional, the batched functions raise an ImportError without it.
+It is only imported by their first call, so importing the engine stays fast.
+"""
+from typing import Iterable, List, Tuple
+
+from .packing import MAX_PIECES, PACKED_SIZE
+from .piece import PIECES, SQUARE_SCORES
+from .position import Position
+
+# Codes of the pieces, in the order of the planes
+PLANE_CODES = [code for (code, piece) in enumerate(PIECES) if piece]
+
+numpy = None
+# Score of every piece code on every square, the black scores negated
+SCORE_TABLE = None
+# Scores of the pieces of each plane, as 8x8 boards
+PLANE_TABLE = None
+
+
+def require_numpy():
+    """
+    Import NumPy and build the tables, on the first call
+    """
+    global numpy, SCORE_TABLE, PLANE_TABLE
+    if numpy is not None:
+        return
+    try:
+        import numpy as module
+    except ImportError:
+        raise ImportError("the batched evaluation needs NumPy: pip install numpy")
+
+    numpy = module
+    SCORE_TABLE = numpy.array(SQUARE_SCORES, dtype=numpy.float64)
+    PLANE_TABLE = SCORE_TABLE[PLANE_CODES].reshape(len(PLANE_CODES), 8, 8)
+
+
+def encode_positions(grids: Iterable[Position]):
+    """
+    Return the piece codes of the positions, as an array of shape (n, 64)
+    """
+    require_numpy()
+    return numpy.array([grid.squares for grid in grids], dtype=numpy.uint8)
+
+
+def encode_planes(codes):
+    """
+    Convert the piece codes of encode_positions into planes of shape (n, 12, 8, 8),
+    set to 1 where a piece of the code of the plane is
+    """
+    require_numpy()
+    codes = numpy.asarray(codes).reshape(-1, 8, 8)
+    return numpy.stack(
+        [codes == code for code in PLANE_CODES], axis=1
+    ).astype(numpy.uint8)
+
+
+def pack_batch(codes, colors):
+    """
+    Pack the piece codes of encode_positions and the colors to move ("white" or
+    "black") into the 32 bytes of each position of packing.py, all at once
+    """
+    require_numpy()
+    codes = numpy.asarray(codes, dtype=numpy.uint8).reshape(-1, 64)
+    occupied = codes != 0
+    if (occupied.sum(axis=1) > MAX_PIECES).any():
+        raise ValueError(f"positions of more than {MAX_PIECES} pieces can't be packed")
+
+    packed = numpy.zeros((len(codes), PACKED_SIZE), dtype=numpy.uint8)
+    # The bit of the square 63 comes first in the big-endian bitboard.
+    packed[:, :8] = numpy.packbits(occupied[:, ::-1], axis=1)
+    # A stable sort brings the occupied squares first, keeping their order.
+    order = numpy.argsort(~occupied, axis=1, kind="stable")[:, :MAX_PIECES]
+    pieces = numpy.take_along_axis(codes, order, axis=1)
+    pieces[~numpy.take_along_axis(occupied, order, axis=1)] = 0
+    packed[:, 8:24] = pieces[:, 0::2] << 4 | pieces[:, 1::2]
+    packed[:, 24] = numpy.asarray(colors) == "black"
+    return packed.tobytes()
+
+
+def unpack_batch(data):
+    """
+    Return the piece codes, as an array of shape (n, 64), and whether black is to
+    move, as an array of shape (n,), of the positions packed in the data
+    """
+    require_numpy()
+    packed = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, PACKED_SIZE)
+    occupied = numpy.unpackbits(packed[:, :8], axis=1)[:, ::-1].astype(bool)
+    pieces = numpy.empty((len(packed), MAX_PIECES), dtype=numpy.uint8)
+    pieces[:, 0::2] = packed[:, 8:24] >> 4
+    pieces[:, 1::2] = packed[:, 8:24] & 15
+    # The n-th occupied square holds the n-th piece.
+    index = numpy.cumsum(occupied, axis=1) - 1
+    codes = numpy.take_along_axis(pieces, numpy.clip(index, 0, None), axis=1)
+    codes[~occupied] = 0
+    return codes, packed[:, 24] != 0
+
+
+def evaluate_batch(positions):
+    """
+    Return the score of each position, positive when white is ahead.
+    The positions are given as piece codes (n, 64) or as planes (n, 12, 8, 8).
+    """
+    require_numpy()
+    positions = numpy.asarray(positions)
+    if positions.ndim == 4:
+        return numpy.einsum("npxy,pxy->n", positions, PLANE_TABLE)
+    return SCORE_TABLE[positions, numpy.arange(64)].sum(axis=1)
+
+
+def evaluate_moves(grid: Position, moves: List[Tuple[int, int]]) -> List[float]:
+    """
+    Return the score of the grid after each of the (start, end) moves,
+    without playing them.
+
+    The moves of a node are too few for NumPy to be faster than a list here,
+    so this is the version used by the search.
+    """
+    squares = grid.squares
+    score = grid.score
+    return [
+        score
+        + SQUARE_SCORES[squares[start]][end]
+        - SQUARE_SCORES[squares[start]][start]
+        - SQUARE_SCORES[squares[end]][end]
+        for (start, end) in moves
+    ]
@@ -0,0 +1,97 @@
+"""
+Opening book, the moves to play in the known positions of the start of the game.
+
+The book is a binary file of entries sorted by position key, with the same 16 bytes
+layout as the Polyglot books: key (8), move (2), weight (2), learn (4), big-endian.
+The keys are the Zobrist keys of the engine and the moves are packed with
+encode_move, so the Polyglot books can't be read, and the other way around.
+More information here: https://www.chessprogramming.org/Opening_Book
+
+The file is mapped in memory and searched by bisection, nothing is read when opening it.
+"""
+import mmap
+import struct
+from random import Random
+from typing import Dict, List, Optional, Tuple
+
+# Layout of an entry: key, move, weight, learn (unused)
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+
+# Highest weight of an entry
+MAX_WEIGHT = 0xFFFF
+
+
+class OpeningBook:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        size = self.file.seek(0, 2)
+        # An empty file can't be mapped.
+        self.data = b""
+        if size:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = size // ENTRY.size
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def probe(self, key: int) -> List[Tuple[int, int]]:
+        """
+        Return the (move, weight) entries of the position with the given key
+        """
+        data = self.data
+        # Search the first entry with the key.
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        entries = []
+        while low < self.count:
+            (entry_key, move, weight, _) = ENTRY.unpack_from(data, low * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append((move, weight))
+            low += 1
+        return entries
+
+    def choose(self, key: int, rng: Optional[Random] = None) -> Optional[int]:
+        """
+        Return a move of the position picked at random, in proportion of its weight,
+        or None if the position isn't in the book
+        """
+        entries = [(move, weight) for (move, weight) in self.probe(key) if weight]
+        if not entries:
+            return None
+
+        pick = (rng or Random()).randrange(sum(weight for (_, weight) in entries))
+        for (move, weight) in entries:
+            if pick < weight:
+                return move
+            pick -= weight
+        return None
+
+
+def write_book(path: str, weights: Dict[Tuple[int, int], int]):
+    """
+    Write the book of the (key, move) entries with the given weights
+    """
+    highest = max(weights.values(), default=0)
+    with open(path, "wb") as file:
+        for ((key, move), weight) in sorted(weights.items()):
+            # Scale the weights down when they don't fit the entries.
+            if highest > MAX_WEIGHT:
+                weight = max(1, weight * MAX_WEIGHT // highest)
+            if weight > 0:
+                file.write(ENTRY.pack(key, move, weight, 0))
+
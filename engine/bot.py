@@ -0,0 +1,899 @@
+from math import inf, isinf
+from time import perf_counter
+from typing import Optional
+from .batch import evaluate_moves
+from .consts import PAWN, KING, ROOK, PIECE_VALUES
+from .movegen import (
+    filter_legal,
+    generate_captures,
+    generate_moves,
+    is_in_check,
+    legal_moves,
+    static_exchange,
+)
+from .parallel import start_pool
+from .position import Position, square_of, position_of, square_name
+from .stats import SearchStats
+from .tablebase import WIN, LOSS
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER
+from .utils import enemy_color
+
+
+def encode_move(move) -> int:
+    """
+    Pack a (start, end) move into an integer, 0 meaning no move
+    """
+    if move is None:
+        return 0
+    return move[0] << 6 | move[1]
+
+
+def decode_move(move: int):
+    """
+    Unpack a move packed with encode_move
+    """
+    if not move:
+        return None
+    return move >> 6, move & 63
+
+
+def mate_plies(score: float) -> Optional[int]:
+    """
+    Return the number of plies from the root to the mate of a checkmate or
+    tablebase score, or None if the score isn't one of them
+    """
+    if isinf(score) or abs(score) <= TABLEBASE_WIN - MAX_MATE_PLIES:
+        return None
+    win = MATE if abs(score) > MATE - MAX_MATE_PLIES else TABLEBASE_WIN
+    return int(win - abs(score))
+
+
+def score_to_tt(score: float, ply: int) -> float:
+    """
+    Convert a checkmate or tablebase score, counted from the root, into one counted
+    from the node at the ply, to store it in the transposition table
+    """
+    if score > TABLEBASE_WIN - MAX_MATE_PLIES:
+        return score + ply
+    if score < MAX_MATE_PLIES - TABLEBASE_WIN:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: float, ply: int) -> float:
+    """
+    Convert a checkmate or tablebase score of the transposition table back into one
+    counted from the root, for the node at the ply
+    """
+    if score > TABLEBASE_WIN - MAX_MATE_PLIES:
+        return score - ply
+    if score < MAX_MATE_PLIES - TABLEBASE_WIN:
+        return score + ply
+    return score
+
+
+# Values of the pieces by kind, used to order the captures (most valuable victim first,
+# then least valuable attacker first).
+CAPTURE_VALUES = (0, 1, 3, 3, 5, 9, 100)
+
+# Ordering scores of the moves, the hash move first, then the captures,
+# then the killer moves, and then the quiet moves by their history score.
+HASH_MOVE_ORDER = 1 << 30
+CAPTURE_ORDER = 1 << 29
+KILLER_ORDER = 1 << 28
+# History scores are halved when one of them reaches that value.
+HISTORY_MAX = 1 << 20
+
+# Null-move pruning: the depth of the search after the null move is reduced by that
+# many more plies, and it is only tried from that depth.
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+# Up to that material besides the pawns, zugzwangs get likely, so the cutoffs of the
+# null move are verified by a reduced search of the position (and without any
+# material besides the pawns, no null move is tried).
+NULL_MOVE_VERIFY_MATERIAL = PIECE_VALUES[ROOK]
+
+# Width of the windows of the scout searches, which only tell if a move is better
+# than alpha. The scores differ by at least 0.5, so nothing can fall inside it.
+NULL_WINDOW = 0.01
+# Half width of the window around the score of the previous iteration, at the root
+ASPIRATION_WINDOW = 5
+
+# Late move reductions: the quiet moves searched after that many moves are searched
+# one ply less deep, from that depth, and searched again if they raise alpha.
+LATE_MOVE_MIN_MOVES = 3
+LATE_MOVE_MIN_DEPTH = 3
+
+# Margin of the delta pruning of the quiescence search, for the change of the square
+# scores that a capture brings on top of the captured piece
+DELTA_MARGIN = 20
+
+# Score of a win found in the tablebases, less the plies to the mate, so it stays
+# above any evaluation and the shortest mates are preferred.
+TABLEBASE_WIN = 100000
+# Longest mate of the tablebases, in plies
+MAX_MATE_PLIES = 256
+# Score of a checkmate, less the plies from the root to it, so the mates found by
+# the search are the highest scores and the shortest ones are preferred.
+MATE = 1000000
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when its time or node budget is exhausted
+    """
+
+
+class Bot:
+    # The budget is verified every that many nodes (plus one).
+    CHECK_BUDGET_EVERY = 255
+
+    def __init__(
+        self,
+        board=None,
+        depth=3,
+        hash_size_mb=16,
+        time_limit=None,
+        node_limit=None,
+        workers=1,
+    ):
+        self.board = board
+        # Maximum depth of the search
+        self.depth = depth
+        # Maximum time in seconds, and number of nodes, of a search (None for no limit)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.deadline = None
+        # Event that stops the current search when set, and callback of its iterations
+        self.stop_event = None
+        self.on_iteration = None
+        # Number of nodes visited by the last search
+        self.nodes = 0
+        # Depth of the last iteration the last search completed
+        self.completed_depth = 0
+        # Results of the previous searches, shared between the moves of a game
+        self.tt = TranspositionTable(hash_size_mb)
+
+        # Two quiet moves per ply that recently caused a beta cutoff
+        self.killers = [[None, None] for _ in range(depth + 1)]
+        # Score of each quiet (start, end) move, raised when it causes a beta cutoff
+        self.history = [0] * 4096
+
+        # Number of beta cutoffs, and of the ones caused by the first move searched
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        # Number of nodes searched by each completed iteration, and its time in seconds
+        self.iteration_nodes = []
+        self.iteration_times = []
+        # Number of nodes of the quiescence search, and of moves tested for leaving
+        # the king in check
+        self.quiescence_nodes = 0
+        self.legality_checks = 0
+        # Number of cutoffs of the null moves, of reduced moves, and of the reduced
+        # moves searched again at full depth
+        self.null_move_cutoffs = 0
+        self.reductions = 0
+        self.researches = 0
+        # Number of root searches repeated because their score fell out of the
+        # aspiration window
+        self.aspiration_failures = 0
+
+        # Principal variation of the last completed iteration, the moves expected
+        # from both sides, as ((x, y), (x, y)) moves, and its score
+        self.pv = []
+        self.score = None
+        # Principal variation found from each ply of the current search
+        self.pv_lines = [[] for _ in range(depth + 2)]
+
+        # Evaluate the leaves of the frontier nodes all at once, to skip the ones
+        # that can't raise alpha
+        self.batch_leaves = True
+        # Statistics of the last move, the callback they are passed to after each move,
+        # and the file they are appended to as JSON lines (None for neither)
+        self.stats = None
+        self.on_stats = None
+        self.stats_log = None
+
+        # Selective search: skip the nodes where passing the turn still fails high,
+        # and search the late quiet moves less deep
+        self.null_move_pruning = True
+        self.late_move_reductions = True
+
+        # Opening book consulted before searching (None to always search)
+        self.book = None
+        # Endgame tablebases probed at the root and during the search (None to search)
+        self.tablebases = None
+
+        # Number of processes searching in parallel, and the pool of the other ones
+        self.workers = 1
+        self.helpers = None
+        # Number of nodes searched by each helper process during the last search
+        self.helper_nodes = []
+        if workers > 1:
+            self.set_workers(workers)
+
+    def set_workers(self, workers: int):
+        """
+        Change the number of processes searching in parallel, 1 to search alone
+        """
+        self.close()
+        self.workers = workers
+        # The processes share their results through a table in shared memory.
+        if workers > 1 and not self.tt.shared:
+            self.tt.close()
+            self.tt = TranspositionTable(self.tt.size_mb, shared=True)
+        self.helpers = start_pool(workers, self.tt)
+
+    def set_hash_size(self, size_mb: int):
+        """
+        Change the size of the transposition table, which clears it
+        """
+        self.tt.resize(size_mb)
+        # A shared table is moved to a new memory block, the helpers must use it.
+        if self.helpers:
+            self.set_workers(self.workers)
+
+    def close(self):
+        """
+        Stop the helper processes of the parallel search
+        """
+        if self.helpers:
+            self.helpers.close()
+            self.helpers = None
+
+    def reset_search(self, stop_event=None, on_iteration=None):
+        """
+        Reset the statistics and the move ordering before a new search
+        """
+        self.stop_event = stop_event
+        self.on_iteration = on_iteration
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.iteration_nodes = []
+        self.iteration_times = []
+        self.quiescence_nodes = 0
+        self.legality_checks = 0
+        self.null_move_cutoffs = 0
+        self.reductions = 0
+        self.researches = 0
+        self.aspiration_failures = 0
+        self.helper_nodes = []
+        self.pv = []
+        self.score = None
+        self.pv_lines = [[] for _ in range(self.depth + 2)]
+        self.tt.reset_stats()
+
+        # Killer moves are specific to a position, but the history is kept (aged).
+        self.killers = [[None, None] for _ in range(self.depth + 1)]
+        self.history = [score >> 1 for score in self.history]
+
+    def play(self, color="black", grid=None, stop_event=None, on_iteration=None):
+        """
+        Search the best move for the given color.
+
+        The search stops early when the stop_event (a threading.Event) is set,
+        and on_iteration(depth, move, score, nodes) is called after each iteration.
+        The statistics of the move are then in self.stats.
+        """
+        start = perf_counter()
+        self.reset_search(stop_event, on_iteration)
+        self.completed_depth = 0
+
+        source = "book"
+        move = self.get_book_move(color, grid)
+        if move is None:
+            source = "tablebase"
+            move = self.get_tablebase_move(color, grid)
+        if move is None:
+            source = "search"
+            self.tt.new_search()
+            move = self.get_negamax_move(self.depth, color, grid)
+
+        self.record_stats(source, color, move, perf_counter() - start)
+        return move
+
+    def record_stats(self, source: str, color: str, move, elapsed: float):
+        """
+        Gather the statistics of the move, and send them to the hook and the log
+        """
+
+        def move_name(move) -> str:
+            (s, e) = move
+            return square_name(square_of(*s)) + square_name(square_of(*e))
+
+        nodes = self.nodes + sum(self.helper_nodes)
+        self.stats = SearchStats(
+            source=source,
+            color=color,
+            move=move_name(move) if move else None,
+            pv=[move_name(pv_move) for pv_move in self.pv],
+            score=self.score,
+            depth=self.completed_depth,
+            nodes=self.nodes,
+            quiescence_nodes=self.quiescence_nodes,
+            helper_nodes=self.helper_nodes,
+            time=elapsed,
+            nps=nodes / elapsed if elapsed else 0.0,
+            iteration_nodes=self.iteration_nodes,
+            iteration_times=self.iteration_times,
+            cutoffs=self.cutoffs,
+            first_move_cutoff_rate=self.first_move_cutoff_rate,
+            null_move_cutoffs=self.null_move_cutoffs,
+            reductions=self.reductions,
+            researches=self.researches,
+            aspiration_failures=self.aspiration_failures,
+            tt_probes=self.tt.probes,
+            tt_hits=self.tt.hits,
+            legality_checks=self.legality_checks,
+        )
+        if self.on_stats is not None:
+            self.on_stats(self.stats)
+        if self.stats_log is not None:
+            self.stats.write(self.stats_log)
+
+    def get_book_move(self, color: str, grid=None):
+        """
+        Return a move of the opening book for the position, or None if it isn't
+        in the book
+        """
+        if self.book is None:
+            return None
+        if not grid:
+            grid = self.board.grid
+
+        move = decode_move(self.book.choose(grid.hash_key(color)))
+        # Keys can collide, the move is only played if it is legal here.
+        if move is None or move not in legal_moves(grid, color):
+            return None
+        (s, e) = move
+        return position_of(s), position_of(e)
+
+    def get_tablebase_move(self, color: str, grid=None):
+        """
+        Return the move leading to the best result of the tablebases, the fastest mate
+        when winning, or None if they don't cover all the moves of the position
+        """
+        if self.tablebases is None:
+            return None
+        if not grid:
+            grid = self.board.grid
+        if self.tablebases.probe(grid, color) is None:
+            return None
+
+        grid = grid.copy()
+        best_move = None
+        best_score = -inf
+        for (s, e) in legal_moves(grid, color):
+            undo = grid.make_move(s, e)
+            result = self.tablebases.probe(grid, enemy_color(color))
+            grid.unmake_move(undo)
+            # A capture may lead to a position without a table.
+            if result is None:
+                return None
+            score = -self.tablebase_score(result, 1)
+            if score > best_score:
+                best_score = score
+                best_move = (s, e)
+
+        if best_move is None:
+            return None
+        (s, e) = best_move
+        return position_of(s), position_of(e)
+
+    @staticmethod
+    def tablebase_score(result, ply: int) -> float:
+        """
+        Score of a (result, plies to the mate) of the tablebases, found at the ply
+        """
+        (outcome, plies) = result
+        if outcome == WIN:
+            return TABLEBASE_WIN - ply - plies
+        if outcome == LOSS:
+            return -(TABLEBASE_WIN - ply - plies)
+        return 0
+
+    def helper_search(self, grid: Position, color: str, index: int, stop_event):
+        """
+        Search the position as the helper process with the given index (from 1),
+        until the stop_event is set or the depth is reached.
+        Return the number of nodes searched.
+        """
+        self.reset_search(stop_event)
+        self.completed_depth = 0
+
+        # Start from another root move, and one level deeper for half of the helpers,
+        # so the helpers don't all search the same nodes.
+        moves = self.legal_moves(grid, color)
+        if moves:
+            shift = index % len(moves)
+            moves = moves[shift:] + moves[:shift]
+
+        for current_depth in range(1 + index % 2, self.depth + 1):
+            if not moves:
+                break
+            try:
+                (results, _) = self.search_root(current_depth, grid, color, moves)
+            except SearchTimeout:
+                break
+            self.completed_depth = current_depth
+            moves = [move for (move, _) in results]
+
+        return self.nodes
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def effective_branching_factor(self) -> float:
+        """
+        Average ratio between the nodes of an iteration and the previous one
+        """
+        nodes = self.iteration_nodes
+        ratios = [
+            current / previous
+            for (previous, current) in zip(nodes, nodes[1:])
+            if previous
+        ]
+        return sum(ratios) / len(ratios) if ratios else 0.0
+
+    def order_moves(self, grid: Position, moves, ply: int, hash_move):
+        """
+        Sort the moves so the ones most likely to cause a beta cutoff are searched first:
+        the hash move, the captures by most valuable victim / least valuable attacker,
+        the killer moves of the ply, and the quiet moves by their history score.
+        """
+        squares = grid.squares
+        killers = self.killers[ply]
+        history = self.history
+
+        def order(move):
+            if move == hash_move:
+                return HASH_MOVE_ORDER
+            victim = squares[move[1]]
+            if victim:
+                return (
+                    CAPTURE_ORDER
+                    + CAPTURE_VALUES[victim & 7] * 128
+                    - CAPTURE_VALUES[squares[move[0]] & 7]
+                )
+            if move == killers[0]:
+                return KILLER_ORDER + 1
+            if move == killers[1]:
+                return KILLER_ORDER
+            return history[move[0] << 6 | move[1]]
+
+        moves.sort(key=order, reverse=True)
+
+    def update_cutoff(self, grid: Position, move, depth: int, ply: int, index: int):
+        """
+        Record the move that caused a beta cutoff, for the move ordering and statistics
+        """
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+        # Captures are already searched early, only the quiet moves are remembered.
+        if grid.squares[move[1]]:
+            return
+
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        history_index = move[0] << 6 | move[1]
+        self.history[history_index] += depth * depth
+        if self.history[history_index] >= HISTORY_MAX:
+            self.history = [score >> 1 for score in self.history]
+
+    def check_budget(self):
+        """
+        Stop the search if it went over its time or node budget, or was asked to stop
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+        # The first iteration is always completed, so there is a move to play.
+        if not self.completed_depth:
+            return
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+        if self.deadline is not None and perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+    def legal_moves(self, grid: Position, color: str):
+        """
+        Return the legal moves of the color, counting their legality tests
+        """
+        moves = generate_moves(grid, color)
+        self.legality_checks += len(moves)
+        return filter_legal(grid, color, moves)
+
+    @staticmethod
+    def evaluate(grid: Position, color: str):
+        """
+        Score of the grid from the point of view of the given color
+        """
+        # The score is kept up to date by the grid on each move.
+        return grid.score if color == "white" else -grid.score
+
+    def quiescence_search(self, grid: Position, color: str, alpha, beta):
+        """
+        Quiescence search is required to avoid move that are dangerous.
+        Only the captures are searched, until the position is quiet, so the score
+        isn't taken in the middle of an exchange (the horizon effect).
+        As explained here: https://www.chessprogramming.org/Quiescence_Search
+        """
+        self.nodes += 1
+        self.quiescence_nodes += 1
+        if not self.nodes & self.CHECK_BUDGET_EVERY:
+            self.check_budget()
+        # The side to move can stand pat, since it doesn't have to capture.
+        stand_pat = self.evaluate(grid, color)
+
+        if stand_pat >= beta:
+            return beta
+        alpha = max(alpha, stand_pat)
+
+        squares = grid.squares
+        captures = generate_captures(grid, color)
+        # Most valuable victim first, then least valuable attacker first.
+        captures.sort(
+            key=lambda move: CAPTURE_VALUES[squares[move[1]] & 7] * 128
+            - CAPTURE_VALUES[squares[move[0]] & 7],
+            reverse=True,
+        )
+        for (s, e) in captures:
+            victim = PIECE_VALUES[squares[e] & 7]
+            # Delta pruning: even winning the piece for free can't raise alpha.
+            if stand_pat + victim + DELTA_MARGIN <= alpha:
+                continue
+            # The captures losing material in the exchange on the square are skipped.
+            if (
+                victim < PIECE_VALUES[squares[s] & 7]
+                and static_exchange(grid, s, e) < 0
+            ):
+                continue
+
+            # Move the piece from s to e, and put it back after the search
+            undo = grid.make_move(s, e)
+            self.legality_checks += 1
+            if is_in_check(grid, color):
+                grid.unmake_move(undo)
+                continue
+            score = -self.quiescence_search(grid, enemy_color(color), -beta, -alpha)
+            grid.unmake_move(undo)
+
+            if score >= beta:
+                return beta
+            if score > alpha:
+                alpha = score
+
+        return alpha
+
+    @staticmethod
+    def piece_material(grid: Position, color: str) -> int:
+        """
+        Value of the pieces of the color, besides its pawns and king
+        """
+        squares = grid.squares
+        return sum(
+            PIECE_VALUES[squares[square] & 7]
+            for square in grid.pieces[color]
+            if squares[square] & 7 not in (PAWN, KING)
+        )
+
+    def negamax(
+        self,
+        depth,
+        grid: Position,
+        color: str,
+        alpha,
+        beta,
+        ply=1,
+        null_move=True,
+        pv_node=False,
+    ):
+        self.nodes += 1
+        if not self.nodes & self.CHECK_BUDGET_EVERY:
+            self.check_budget()
+        # The line of the parent continues with this node's if its move is the best.
+        self.pv_lines[ply] = []
+        if depth == 0:
+            return self.quiescence_search(grid, color, alpha, beta)
+
+        # The result of the endgames with a few pieces is known exactly.
+        if self.tablebases is not None:
+            result = self.tablebases.probe(grid, color)
+            if result is not None:
+                return self.tablebase_score(result, ply)
+
+        # Reuse the result of a previous search of the same position, if it went deep enough.
+        key = grid.hash_key(color)
+        entry = self.tt.probe(key)
+        hash_move = None
+        if entry:
+            (entry_depth, entry_score, entry_bound, entry_move) = entry
+            # The distances to the tablebase mates are stored from the node.
+            entry_score = score_from_tt(entry_score, ply)
+            # The nodes of the principal variation are searched, to find its line.
+            if not pv_node and entry_depth >= depth and (
+                entry_bound == EXACT
+                or (entry_bound == LOWER and entry_score >= beta)
+                or (entry_bound == UPPER and entry_score <= alpha)
+            ):
+                return entry_score
+            hash_move = decode_move(entry_move)
+
+        in_check = is_in_check(grid, color)
+
+        # If the position still fails high when the other side plays twice in a row,
+        # a real move would too: pass the turn, and search less deep.
+        # More information here: https://www.chessprogramming.org/Null_Move_Pruning
+        if (
+            self.null_move_pruning
+            and null_move
+            and depth >= NULL_MOVE_MIN_DEPTH
+            and not in_check
+            and abs(beta) < TABLEBASE_WIN - MAX_MATE_PLIES
+            and self.evaluate(grid, color) >= beta
+        ):
+            material = self.piece_material(grid, color)
+            if material:
+                reduced = depth - 1 - NULL_MOVE_REDUCTION
+                score = -self.negamax(
+                    max(reduced, 0),
+                    grid,
+                    enemy_color(color),
+                    -beta,
+                    -beta + NULL_WINDOW,
+                    ply + 1,
+                    False,
+                )
+                # In zugzwang, passing would be the best move: verify the cutoff.
+                if score >= beta and material <= NULL_MOVE_VERIFY_MATERIAL:
+                    score = self.negamax(
+                        depth - NULL_MOVE_REDUCTION,
+                        grid,
+                        color,
+                        beta - NULL_WINDOW,
+                        beta,
+                        ply,
+                        False,
+                    )
+                if score >= beta:
+                    self.null_move_cutoffs += 1
+                    return beta
+
+        # Get all the legal moves possible on the grid.
+        new_moves = self.legal_moves(grid, color)
+
+        # Without any legal move, it is either a checkmate or a stalemate.
+        if not new_moves:
+            return -(MATE - ply) if in_check else 0
+
+        # Search first the moves most likely to be the best.
+        self.order_moves(grid, new_moves, ply, hash_move)
+
+        # The children of a frontier node go straight to the quiescence search,
+        # which returns their static score if it already fails high for them.
+        leaf_scores = None
+        if depth == 1 and self.batch_leaves and alpha > -inf:
+            leaf_scores = evaluate_moves(grid, new_moves)
+            if color == "black":
+                leaf_scores = [-score for score in leaf_scores]
+
+        squares = grid.squares
+        killers = self.killers[ply]
+        reduce = (
+            self.late_move_reductions and depth >= LATE_MOVE_MIN_DEPTH and not in_check
+        )
+
+        alpha_start = alpha
+        best_score = -inf
+        best_move = None
+        for (index, (s, e)) in enumerate(new_moves):
+            if leaf_scores is not None and leaf_scores[index] <= alpha:
+                # The child would fail high, and the move would score alpha.
+                self.nodes += 1
+                score = alpha
+                self.pv_lines[ply + 1] = []
+            else:
+                # Move the piece from s to e, the grid is restored after the child search.
+                quiet = not squares[e]
+                undo = grid.make_move(s, e)
+                score = self.search_move(
+                    depth,
+                    grid,
+                    enemy_color(color),
+                    alpha,
+                    beta,
+                    ply,
+                    index,
+                    reduce and quiet and (s, e) not in killers,
+                    pv_node,
+                )
+                grid.unmake_move(undo)
+
+            # With a mate score as bound, every move may score -inf, keep one anyway.
+            if score > best_score or best_move is None:
+                best_score = score
+                best_move = (s, e)
+                self.pv_lines[ply] = [(s, e)] + self.pv_lines[ply + 1]
+            if score > alpha:
+                alpha = score
+            if score >= beta:
+                self.update_cutoff(grid, best_move, depth, ply, index)
+                break
+
+        stored_score = score_to_tt(best_score, ply)
+        if best_score >= beta:
+            self.tt.store(key, depth, stored_score, LOWER, encode_move(best_move))
+        elif best_score <= alpha_start:
+            # None of the moves reached alpha, so none of them is known to be the best.
+            self.tt.store(key, depth, stored_score, UPPER, 0)
+        else:
+            self.tt.store(key, depth, stored_score, EXACT, encode_move(best_move))
+
+        return best_score
+
+    def search_move(
+        self,
+        depth,
+        grid: Position,
+        color: str,
+        alpha,
+        beta,
+        ply: int,
+        index: int,
+        reducible: bool,
+        pv_node: bool,
+    ):
+        """
+        Search the position after the move with the given index, with the given color
+        to move, and return its score for the parent.
+
+        This is a principal variation search: the first move is expected to be the
+        best one and searched with the full window, and the others with a null window,
+        which only tells if they are better, and searched again if they are.
+        Only the moves searched with the full window of a node of the principal
+        variation lead to nodes of the principal variation.
+        More information here: https://www.chessprogramming.org/Principal_Variation_Search
+        """
+        full = (-beta, -alpha, ply + 1, True, pv_node)
+        if index == 0 or alpha == -inf:
+            return -self.negamax(depth - 1, grid, color, *full)
+
+        # The late quiet moves are searched one ply less deep first, unless they
+        # give check, and again at full depth if they raise alpha.
+        # More information here: https://www.chessprogramming.org/Late_Move_Reductions
+        reduction = 0
+        if reducible and index >= LATE_MOVE_MIN_MOVES and not is_in_check(grid, color):
+            reduction = 1
+            self.reductions += 1
+
+        scout = (-alpha - NULL_WINDOW, -alpha)
+        score = -self.negamax(depth - 1 - reduction, grid, color, *scout, ply + 1)
+        if score > alpha and reduction:
+            self.researches += 1
+            score = -self.negamax(depth - 1, grid, color, *scout, ply + 1)
+        if alpha < score < beta:
+            score = -self.negamax(depth - 1, grid, color, *full)
+        return score
+
+    def search_root(
+        self, depth, grid: Position, color: str, moves, alpha=-inf, beta=inf
+    ):
+        """
+        Search the moves of the root at the given depth, within the window.
+        Return the score of each move, the best one first, and the principal variation.
+        The search stops at the first move reaching beta, the moves left unsearched
+        are then returned last, with a score of -inf.
+        """
+        scores = {}
+        pv = []
+        best_score = None
+
+        for (index, (s, e)) in enumerate(moves):
+            undo = grid.make_move(s, e)
+            score = self.search_move(
+                depth, grid, enemy_color(color), alpha, beta, 0, index, False, True
+            )
+            grid.unmake_move(undo)
+
+            scores[s, e] = score
+            if best_score is None or score > best_score:
+                best_score = score
+                pv = [(s, e)] + self.pv_lines[1]
+            if score > alpha:
+                alpha = score
+            if score >= beta:
+                break
+
+        # Sorting is stable, so the first move is kept on equal scores.
+        results = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        results += [(move, -inf) for move in moves if move not in scores]
+        return results, pv
+
+    def get_negamax_move(self, depth=3, color="black", grid=None):
+        """
+        Search one more level deeper at each iteration, until the depth is reached
+        or the time or node budget is exhausted.
+        Return the best move of the last completed iteration.
+        """
+        if not grid:
+            grid = self.board.grid
+
+        # Search on a copy, so the board is never changed by the search.
+        grid = grid.copy()
+
+        moves = self.legal_moves(grid, color)
+        if not moves:
+            return None
+
+        if self.time_limit is not None:
+            self.deadline = perf_counter() + self.time_limit
+        self.completed_depth = 0
+        best_next_node = moves[0]
+        iteration_start = perf_counter()
+
+        if self.helpers:
+            self.helpers.start(grid, color, depth, self.tt.age)
+
+        score = None
+        for current_depth in range(1, depth + 1):
+            # Search within a window around the score of the previous iteration,
+            # and again with the window open on the side the score falls out of.
+            # More information here: https://www.chessprogramming.org/Aspiration_Windows
+            (alpha, beta) = (-inf, inf)
+            if score is not None and abs(score) < TABLEBASE_WIN // 2:
+                (alpha, beta) = (score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW)
+            try:
+                while True:
+                    (results, pv) = self.search_root(
+                        current_depth, grid, color, moves, alpha, beta
+                    )
+                    score = results[0][1]
+                    if score <= alpha and alpha > -inf:
+                        alpha = -inf
+                    elif score >= beta and beta < inf:
+                        beta = inf
+                    else:
+                        break
+                    self.aspiration_failures += 1
+                    moves = [move for (move, _) in results]
+            except SearchTimeout:
+                break
+
+            self.completed_depth = current_depth
+            self.iteration_nodes.append(self.nodes - sum(self.iteration_nodes))
+            self.iteration_times.append(perf_counter() - iteration_start)
+            iteration_start = perf_counter()
+            (best_next_node, best_next_score) = results[0]
+            self.pv = [(position_of(s), position_of(e)) for (s, e) in pv]
+            self.score = best_next_score
+
+            if self.on_iteration is not None:
+                (s, e) = best_next_node
+                self.on_iteration(
+                    current_depth,
+                    (position_of(s), position_of(e)),
+                    best_next_score,
+                    self.nodes,
+                )
+
+            # Search the best moves of this iteration first in the next one.
+            moves = [move for (move, _) in results]
+
+            # No need to search deeper once a forced checkmate is found.
+            if abs(best_next_score) > MATE - MAX_MATE_PLIES:
+                break
+
+        self.deadline = None
+        if self.helpers:
+            self.helper_nodes = self.helpers.stop()
+
+        # Convert the squares of the move back to positions on the board.
+        (s, e) = best_next_node
+        return position_of(s), position_of(e)
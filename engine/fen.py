@@ -0,0 +1,74 @@
+"""
+Reading and writing of the positions in the Forsyth-Edwards Notation.
+More information here: https://www.chessprogramming.org/Forsyth-Edwards_Notation
+"""
+from typing import Tuple
+
+from .consts import BLACK_BIT, KING
+from .position import Position, square_of
+
+# Letters of the pieces in the FEN notation, by code.
+PIECE_LETTERS = "?pnbrqk"
+
+INITIAL_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1"
+
+
+def parse_fen(fen: str) -> Tuple[Position, str]:
+    """
+    Return the position and the color to move of a FEN string,
+    only its piece placement and active color are used.
+    Raise a ValueError if the piece placement isn't a valid 8x8 board,
+    with exactly one king of each color.
+    """
+    fields = fen.split()
+    rows = fields[0].split("/") if fields else []
+    if len(rows) != 8:
+        raise ValueError(f"invalid FEN, 8 rows expected: {fen!r}")
+
+    grid = Position()
+    for (y, row) in enumerate(rows):
+        x = 0
+        for letter in row:
+            if letter.isdigit():
+                x += int(letter)
+                continue
+            code = PIECE_LETTERS.find(letter.lower())
+            if code <= 0 or x >= 8:
+                raise ValueError(f"invalid FEN, bad row {row!r}: {fen!r}")
+            if letter.islower():
+                code |= BLACK_BIT
+            grid.put(square_of(x, y), code)
+            x += 1
+        if x != 8:
+            raise ValueError(f"invalid FEN, bad row {row!r}: {fen!r}")
+
+    for (side, black) in (("white", 0), ("black", BLACK_BIT)):
+        if bin(grid.bitboards[KING | black]).count("1") != 1:
+            raise ValueError(f"invalid FEN, one {side} king expected: {fen!r}")
+
+    color = "black" if len(fields) > 1 and fields[1] == "b" else "white"
+    return grid, color
+
+
+def to_fen(grid: Position, color: str, halfmoves: int = 0, moves: int = 1) -> str:
+    """
+    Return the FEN string of the position with the given color to move.
+    Without castling nor en passant, their fields are always "-".
+    """
+    rows = []
+    for y in range(8):
+        row = ""
+        empty = 0
+        for code in grid.squares[y * 8 : y * 8 + 8]:
+            if not code:
+                empty += 1
+                continue
+            if empty:
+                row += str(empty)
+                empty = 0
+            letter = PIECE_LETTERS[code & ~BLACK_BIT]
+            row += letter if code & BLACK_BIT else letter.upper()
+        if empty:
+            row += str(empty)
+        rows.append(row)
+    return f"{'/'.join(rows)} {color[0]} - - {halfmoves} {moves}"
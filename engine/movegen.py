@@ -0,0 +1,333 @@
+"""
+Move generation using bitboards, ints where bit y * 8 + x is set for each square of a set.
+More information here: https://www.chessprogramming.org/Bitboards
+"""
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+from .consts import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, BLACK_BIT, PIECE_VALUES
+
+if TYPE_CHECKING:
+    from .position import Position
+
+
+def _bitboard(positions) -> int:
+    """
+    Return the bitboard of the given (x, y) positions, ignoring the ones out of the board
+    """
+    bitboard = 0
+    for (x, y) in positions:
+        if 0 <= x < 8 and 0 <= y < 8:
+            bitboard |= 1 << (y * 8 + x)
+    return bitboard
+
+
+def _jumps(offsets) -> List[int]:
+    """
+    Return, for each square, the bitboard of the squares at the given offsets from it
+    """
+    return [
+        _bitboard(((square & 7) + dx, (square >> 3) + dy) for (dx, dy) in offsets)
+        for square in range(64)
+    ]
+
+
+def _rays(dx: int, dy: int) -> List[int]:
+    """
+    Return, for each square, the bitboard of the squares in the given direction
+    from it (excluded) up to the edge of the board
+    """
+    return _jumps([(dx * distance, dy * distance) for distance in range(1, 8)])
+
+
+# Attacks of the pieces that don't slide, for each square.
+KNIGHT_ATTACKS = _jumps(
+    ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+)
+KING_ATTACKS = _jumps(
+    ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+)
+# White pawns move up the board (toward y = 0), and black pawns move down.
+PAWN_ATTACKS = {
+    "white": _jumps(((-1, -1), (1, -1))),
+    "black": _jumps(((-1, 1), (1, 1))),
+}
+PAWN_DIRECTION = {"white": -8, "black": 8}
+PAWN_START_ROW = {"white": 6, "black": 1}
+
+# Rays of the sliding pieces, for each direction and square.
+# On the "positive" rays the square index increases, so their first blocker is
+# their lowest set bit, while it is the highest one on the "negative" rays.
+ROOK_POSITIVE_RAYS = (_rays(1, 0), _rays(0, 1))
+ROOK_NEGATIVE_RAYS = (_rays(-1, 0), _rays(0, -1))
+BISHOP_POSITIVE_RAYS = (_rays(1, 1), _rays(-1, 1))
+BISHOP_NEGATIVE_RAYS = (_rays(-1, -1), _rays(1, -1))
+
+
+def iter_squares(bitboard: int) -> Iterator[int]:
+    """
+    Iterate over the squares set in the bitboard
+    """
+    while bitboard:
+        bit = bitboard & -bitboard
+        yield bit.bit_length() - 1
+        bitboard ^= bit
+
+
+def _slider_attacks(square: int, occupied: int, positive_rays, negative_rays) -> int:
+    attacks = 0
+    for rays in positive_rays:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            # Remove the squares behind the first blocker.
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in negative_rays:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    return _slider_attacks(square, occupied, ROOK_POSITIVE_RAYS, ROOK_NEGATIVE_RAYS)
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    return _slider_attacks(square, occupied, BISHOP_POSITIVE_RAYS, BISHOP_NEGATIVE_RAYS)
+
+
+def attacks(code: int, square: int, occupied: int) -> int:
+    """
+    Return the squares attacked by the piece with the given code, whatever is on them.
+    Pawns only attack diagonally.
+    """
+    kind = code & 7
+    if kind == PAWN:
+        return PAWN_ATTACKS["black" if code & BLACK_BIT else "white"][square]
+    elif kind == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    elif kind == BISHOP:
+        return bishop_attacks(square, occupied)
+    elif kind == ROOK:
+        return rook_attacks(square, occupied)
+    elif kind == QUEEN:
+        return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+    elif kind == KING:
+        return KING_ATTACKS[square]
+    return 0
+
+
+def pawn_pushes(color: str, square: int, occupied: int) -> int:
+    """
+    Return the empty squares the pawn can be pushed to, two of them from its starting row
+    """
+    target = square + PAWN_DIRECTION[color]
+    if not 0 <= target < 64 or occupied >> target & 1:
+        return 0
+
+    pushes = 1 << target
+    if square >> 3 == PAWN_START_ROW[color]:
+        target += PAWN_DIRECTION[color]
+        if not occupied >> target & 1:
+            pushes |= 1 << target
+    return pushes
+
+
+def quiet_targets(code: int, square: int, occupied: int) -> int:
+    """
+    Return the empty squares the piece with the given code can move to
+    """
+    if code & 7 == PAWN:
+        return pawn_pushes("black" if code & BLACK_BIT else "white", square, occupied)
+    return attacks(code, square, occupied) & ~occupied
+
+
+def generate_moves(position: "Position", color: str) -> List[Tuple[int, int]]:
+    """
+    Return the (start, end) squares of all the moves of the given color,
+    without verifying if they leave the king in check.
+    """
+    squares = position.squares
+    own = position.occupied[color]
+    enemy = position.occupied["black" if color == "white" else "white"]
+    occupied = own | enemy
+    pawn_attacks = PAWN_ATTACKS[color]
+    moves = []
+
+    for start in position.pieces[color]:
+        kind = squares[start] & 7
+        if kind == PAWN:
+            targets = pawn_attacks[start] & enemy | pawn_pushes(color, start, occupied)
+        elif kind == KNIGHT:
+            targets = KNIGHT_ATTACKS[start] & ~own
+        elif kind == BISHOP:
+            targets = bishop_attacks(start, occupied) & ~own
+        elif kind == ROOK:
+            targets = rook_attacks(start, occupied) & ~own
+        elif kind == QUEEN:
+            targets = (
+                rook_attacks(start, occupied) | bishop_attacks(start, occupied)
+            ) & ~own
+        else:
+            targets = KING_ATTACKS[start] & ~own
+
+        while targets:
+            bit = targets & -targets
+            moves.append((start, bit.bit_length() - 1))
+            targets ^= bit
+
+    return moves
+
+
+def generate_captures(position: "Position", color: str) -> List[Tuple[int, int]]:
+    """
+    Return the (start, end) squares of the captures of the given color,
+    without verifying if they leave the king in check.
+    """
+    squares = position.squares
+    own = position.occupied[color]
+    enemy = position.occupied["black" if color == "white" else "white"]
+    occupied = own | enemy
+    moves = []
+
+    for start in position.pieces[color]:
+        targets = attacks(squares[start], start, occupied) & enemy
+        while targets:
+            bit = targets & -targets
+            moves.append((start, bit.bit_length() - 1))
+            targets ^= bit
+
+    return moves
+
+
+def attackers_to(position: "Position", square: int, occupied: int) -> int:
+    """
+    Return the squares of the pieces of both colors attacking the square,
+    with the sliding pieces blocked by the given occupied squares only
+    """
+    bitboards = position.bitboards
+    rooks = (
+        bitboards[ROOK]
+        | bitboards[ROOK | BLACK_BIT]
+        | bitboards[QUEEN]
+        | bitboards[QUEEN | BLACK_BIT]
+    )
+    bishops = (
+        bitboards[BISHOP]
+        | bitboards[BISHOP | BLACK_BIT]
+        | bitboards[QUEEN]
+        | bitboards[QUEEN | BLACK_BIT]
+    )
+    # The pawns attacking the square are where a pawn of the other color would attack.
+    return (
+        KNIGHT_ATTACKS[square] & (bitboards[KNIGHT] | bitboards[KNIGHT | BLACK_BIT])
+        | KING_ATTACKS[square] & (bitboards[KING] | bitboards[KING | BLACK_BIT])
+        | PAWN_ATTACKS["black"][square] & bitboards[PAWN]
+        | PAWN_ATTACKS["white"][square] & bitboards[PAWN | BLACK_BIT]
+        | rook_attacks(square, occupied) & rooks
+        | bishop_attacks(square, occupied) & bishops
+    )
+
+
+def static_exchange(position: "Position", start: int, end: int) -> int:
+    """
+    Return the material won by the capture from start to end once all the captures
+    on the end square are played, each side recapturing with its least valuable
+    piece and stopping when it would lose material.
+    More information here: https://www.chessprogramming.org/Static_Exchange_Evaluation
+    """
+    squares = position.squares
+    bitboards = position.bitboards
+    occupied = (position.occupied["white"] | position.occupied["black"]) ^ 1 << start
+
+    # Material won after each capture, for the side making it.
+    gains = [PIECE_VALUES[squares[end] & 7]]
+    captured = squares[start] & 7
+    side = (squares[start] & BLACK_BIT) ^ BLACK_BIT
+    while True:
+        # Removing a piece may uncover a sliding piece behind it.
+        attackers = attackers_to(position, end, occupied) & occupied
+        for kind in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            pieces = attackers & bitboards[kind | side]
+            if pieces:
+                break
+        else:
+            break
+        # The king can't capture a defended piece.
+        if kind == KING and attackers & position.occupied["white" if side else "black"]:
+            break
+        gains.append(PIECE_VALUES[captured] - gains[-1])
+        captured = kind
+        occupied ^= pieces & -pieces
+        side ^= BLACK_BIT
+
+    # Either side can stop capturing, when going on loses more.
+    while len(gains) > 1:
+        gains[-2] = -max(-gains[-2], gains[-1])
+        gains.pop()
+    return gains[0]
+
+
+def is_square_attacked(position: "Position", square: int, by_color: str) -> bool:
+    """
+    Check if the square is attacked by a piece of the given color.
+
+    Instead of generating the moves of every enemy piece, look outward from the square:
+    a knight attacks it if a knight on the square could jump to that knight,
+    a rook or queen if the rook rays from the square reach it, and so on.
+    """
+    bitboards = position.bitboards
+    black = BLACK_BIT if by_color == "black" else 0
+
+    if KNIGHT_ATTACKS[square] & bitboards[KNIGHT | black]:
+        return True
+    # The pawns attacking the square are where a pawn of the other color would attack.
+    if PAWN_ATTACKS["white" if black else "black"][square] & bitboards[PAWN | black]:
+        return True
+    if KING_ATTACKS[square] & bitboards[KING | black]:
+        return True
+
+    occupied = position.occupied["white"] | position.occupied["black"]
+    queens = bitboards[QUEEN | black]
+    if rook_attacks(square, occupied) & (bitboards[ROOK | black] | queens):
+        return True
+    if bishop_attacks(square, occupied) & (bitboards[BISHOP | black] | queens):
+        return True
+
+    return False
+
+
+def is_in_check(position: "Position", color: str) -> bool:
+    """
+    Check if the king of the given color is attacked
+    """
+    king = position.king_square(color)
+    if king is None:
+        return False
+    return is_square_attacked(position, king, "black" if color == "white" else "white")
+
+
+def legal_moves(position: "Position", color: str) -> List[Tuple[int, int]]:
+    """
+    Return the moves of the given color that don't leave its king in check
+    """
+    return filter_legal(position, color, generate_moves(position, color))
+
+
+def filter_legal(
+    position: "Position", color: str, moves: List[Tuple[int, int]]
+) -> List[Tuple[int, int]]:
+    """
+    Return the moves of the given color, among the (start, end) moves,
+    that don't leave its king in check
+    """
+    res = []
+    for (start, end) in moves:
+        undo = position.make_move(start, end)
+        if not is_in_check(position, color):
+            res.append((start, end))
+        position.unmake_move(undo)
+    return res
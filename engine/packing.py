@@ -0,0 +1,78 @@
+"""
+Compact binary encoding of the positions, to store and exchange many of them.
+
+Each position is packed in 32 bytes:
+- the bitboard of the occupied squares, as a 64 bits big-endian integer
+- the codes of the pieces, 4 bits each, in the order of their squares (at most 32)
+- the color to move, 0 for white and 1 for black
+- 7 bytes set to 0, so the positions stay aligned on 32 bytes
+
+Without castling nor en passant, nothing else is needed to search a position.
+The packed positions are just concatenated, so a file of them can be indexed or
+mapped in memory directly. batch.py decodes them with NumPy, many at once.
+More information here: https://www.chessprogramming.org/Board_Representation
+"""
+import struct
+from typing import Iterable, List, Tuple
+
+from .position import Position
+
+PACKED = struct.Struct(">Q16sB7x")
+# Size in bytes of a packed position
+PACKED_SIZE = PACKED.size
+# Largest number of pieces of a packed position
+MAX_PIECES = 32
+
+
+def pack_position(grid: Position, color: str) -> bytes:
+    """
+    Return the 32 bytes of the position with the given color to move
+    """
+    codes = [code for code in grid.squares if code]
+    if len(codes) > MAX_PIECES:
+        raise ValueError(f"{len(codes)} pieces can't be packed, {MAX_PIECES} at most")
+    # The last byte is padded with an empty nibble, and the rest by the struct.
+    codes.append(0)
+    nibbles = bytes(
+        codes[index] << 4 | codes[index + 1] for index in range(0, len(codes) - 1, 2)
+    )
+    occupied = grid.occupied["white"] | grid.occupied["black"]
+    return PACKED.pack(occupied, nibbles, color == "black")
+
+
+def unpack_fields(occupied: int, nibbles: bytes, black: int) -> Tuple[Position, str]:
+    """
+    Return the position and the color to move of the fields of a packed position
+    """
+    grid = Position()
+    index = 0
+    while occupied:
+        square = (occupied & -occupied).bit_length() - 1
+        byte = nibbles[index >> 1]
+        grid.put(square, byte & 15 if index & 1 else byte >> 4)
+        occupied &= occupied - 1
+        index += 1
+    return grid, "black" if black else "white"
+
+
+def unpack_position(data: bytes, offset: int = 0) -> Tuple[Position, str]:
+    """
+    Return the position and the color to move packed at the offset of the data
+    """
+    return unpack_fields(*PACKED.unpack_from(data, offset))
+
+
+def pack_positions(positions: Iterable[Tuple[Position, str]]) -> bytes:
+    """
+    Return the packed (position, color to move) pairs, one after the other
+    """
+    return b"".join(pack_position(grid, color) for (grid, color) in positions)
+
+
+def unpack_positions(data: bytes) -> List[Tuple[Position, str]]:
+    """
+    Return the (position, color to move) pairs of the packed positions
+    """
+    if len(data) % PACKED_SIZE:
+        raise ValueError(f"the size of packed positions is a multiple of {PACKED_SIZE}")
+    return [unpack_fields(*fields) for fields in PACKED.iter_unpack(data)]
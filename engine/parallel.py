@@ -0,0 +1,99 @@
+"""
+Parallel search of the bot, using Lazy SMP.
+More information here: https://www.chessprogramming.org/Lazy_SMP
+
+Helper processes search the same position as the bot, all of them sharing one
+transposition table in shared memory. They don't return any move: they fill the
+table, so the bot finds more results in it and searches fewer nodes.
+To not all search the same moves at the same time, each helper starts with its
+root moves in another order, and half of them start one level deeper.
+The position is sent to them packed in 32 bytes, instead of pickling the grid.
+"""
+import multiprocessing
+from typing import List, Optional
+
+from .packing import pack_position, unpack_position
+from .position import Position
+from .transposition import TranspositionTable
+
+# Bot of the helper process, and the event telling it to stop its search
+_helper_bot = None
+_helper_stop = None
+
+
+def _init_helper(table_name: str, size_mb: int, stop):
+    """
+    Prepare a helper process, attached to the shared transposition table
+    """
+    global _helper_bot, _helper_stop
+    # Imported here, as the bot module imports this one.
+    from .bot import Bot
+
+    _helper_bot = Bot(None, hash_size_mb=0)
+    _helper_bot.tt = TranspositionTable.attach(table_name, size_mb)
+    _helper_stop = stop
+
+
+def _helper_search(packed: bytes, depth: int, age: int, index: int):
+    """
+    Search the packed position until the main search is done,
+    return the number of nodes
+    """
+    (grid, color) = unpack_position(packed)
+    bot = _helper_bot
+    bot.depth = depth
+    bot.tt.age = age
+    return bot.helper_search(grid, color, index, _helper_stop)
+
+
+class HelperPool:
+    """
+    Pool of helper processes, searching along with the bot in a shared table
+    """
+
+    def __init__(self, helpers: int, tt: TranspositionTable):
+        self.helpers = helpers
+        self.table_name = tt.name
+        # Spawned processes only import the modules they need, and not the window.
+        context = multiprocessing.get_context("spawn")
+        self.stop_event = context.Event()
+        self.pool = context.Pool(
+            helpers,
+            initializer=_init_helper,
+            initargs=(tt.name, tt.size_mb, self.stop_event),
+        )
+        self.results = []
+
+    def start(self, grid: Position, color: str, depth: int, age: int):
+        """
+        Start the helpers on the position
+        """
+        self.stop_event.clear()
+        packed = pack_position(grid, color)
+        self.results = [
+            self.pool.apply_async(_helper_search, (packed, depth, age, index))
+            for index in range(1, self.helpers + 1)
+        ]
+
+    def stop(self) -> List[int]:
+        """
+        Stop the helpers, and return the number of nodes each of them searched
+        """
+        self.stop_event.set()
+        nodes = [result.get() for result in self.results]
+        self.results = []
+        return nodes
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+
+def start_pool(workers: int, tt: TranspositionTable) -> Optional[HelperPool]:
+    """
+    Return a pool of helpers for a search with the given number of workers,
+    the bot itself being the first one
+    """
+    if workers <= 1:
+        return None
+    return HelperPool(workers - 1, tt)
@@ -0,0 +1,142 @@
+from typing import List, Optional, Tuple
+
+from .consts import (
+    EMPTY,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    BLACK_BIT,
+    pawnEvalBlack,
+    pawnEvalWhite,
+    knightEval,
+    rookEvalWhite,
+    rookEvalBlack,
+    bishopEvalWhite,
+    bishopEvalBlack,
+    evalQueen,
+    kingEvalBlack,
+    kingEvalWhite,
+)
+from .movegen import attacks, quiet_targets, iter_squares
+
+
+class Piece:
+    kind = EMPTY
+
+    __slots__ = ("color", "code")
+
+    def __init__(self, color: str):
+        self.color = color
+        self.code = self.kind | (BLACK_BIT if color == "black" else 0)
+
+    @staticmethod
+    def get_score(x, y):
+        raise Exception("get_score() method need to be overwritten")
+
+    @staticmethod
+    def name():
+        raise Exception("Name method need to be overwritten")
+
+    def clone(self):
+        # Pieces don't hold any state besides their type and color,
+        # so the same instance can be shared by every square.
+        return self
+
+    __copy__ = clone
+
+    def get_moves(self, board, grid, x: int, y: int) -> List[Tuple[int, int]]:
+        """
+        Return the empty positions the piece can move to
+        """
+        occupied = grid.occupied["white"] | grid.occupied["black"]
+        targets = quiet_targets(self.code, y * 8 + x, occupied)
+        return [(square & 7, square >> 3) for square in iter_squares(targets)]
+
+    def get_capture_moves(self, board, grid, x: int, y: int) -> List[Tuple[int, int]]:
+        """
+        Return the positions attacked by the piece, whatever is on them.
+        Only the enemy pieces on those positions can be captured.
+        """
+        occupied = grid.occupied["white"] | grid.occupied["black"]
+        targets = attacks(self.code, y * 8 + x, occupied)
+        return [(square & 7, square >> 3) for square in iter_squares(targets)]
+
+
+class Pawn(Piece):
+    kind = PAWN
+    __slots__ = ()
+
+    def get_score(self, x, y):
+        return 10 + (
+            pawnEvalWhite[y][x] if self.color == "white" else pawnEvalBlack[y][x]
+        )
+
+
+class Knight(Piece):
+    kind = KNIGHT
+    __slots__ = ()
+
+    def get_score(self, x, y):
+        return 30 + knightEval[y][x]
+
+
+class Rook(Piece):
+    kind = ROOK
+    __slots__ = ()
+
+    def get_score(self, x, y):
+        return 50 + (
+            rookEvalWhite[y][x] if self.color == "white" else rookEvalBlack[y][x]
+        )
+
+
+class Bishop(Piece):
+    kind = BISHOP
+    __slots__ = ()
+
+    def get_score(self, x, y):
+        return 30 + (
+            bishopEvalWhite[y][x] if self.color == "white" else bishopEvalBlack[y][x]
+        )
+
+
+class Queen(Piece):
+    kind = QUEEN
+    __slots__ = ()
+
+    def get_score(self, x, y):
+        return 90 + evalQueen[y][x]
+
+
+class King(Piece):
+    kind = KING
+    __slots__ = ()
+
+    def get_score(self, x, y):
+        return 900 + (
+            kingEvalWhite[y][x] if self.color == "white" else kingEvalBlack[y][x]
+        )
+
+
+# Shared piece descriptors, indexed by their code.
+# Pieces are immutable, so a single instance per type and color is enough.
+PIECES: List[Optional[Piece]] = [None] * 16
+for piece_type in (Pawn, Knight, Bishop, Rook, Queen, King):
+    for piece_color in ("white", "black"):
+        shared_piece = piece_type(piece_color)
+        PIECES[shared_piece.code] = shared_piece
+
+# Score of every piece on every square, indexed by piece code then square (y * 8 + x).
+# The tables are flattened once here, with the black scores negated,
+# so the score of a board is simply the sum of the entries of its pieces.
+SQUARE_SCORES: List[List[float]] = [[0.0] * 64 for _ in range(16)]
+for shared_piece in PIECES:
+    if shared_piece:
+        sign = -1 if shared_piece.color == "black" else 1
+        SQUARE_SCORES[shared_piece.code] = [
+            sign * shared_piece.get_score(square & 7, square >> 3)
+            for square in range(64)
+        ]
@@ -0,0 +1,247 @@
+from random import Random
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .consts import EMPTY, KING, BLACK_BIT
+from .piece import Piece, PIECES, SQUARE_SCORES
+
+COLORS = ("white", "black")
+
+# Undo record of a move: start, end, moved code, captured code, previous key and score.
+Undo = Tuple[int, int, int, int, int, float]
+
+# Zobrist keys, a random 64 bits number for each piece code on each square.
+# More information here: https://www.chessprogramming.org/Zobrist_Hashing
+# A fixed seed is used, so the keys of a position are the same on every run.
+_random = Random(0x5EED)
+ZOBRIST_PIECES = [[_random.getrandbits(64) for _ in range(64)] for _ in range(16)]
+# Key mixed in the position key when black is the side to move.
+ZOBRIST_BLACK_TO_MOVE = _random.getrandbits(64)
+
+
+def square_of(x: int, y: int) -> int:
+    """
+    Convert a (x, y) position on the board into a square index
+    """
+    return y * 8 + x
+
+
+def position_of(square: int) -> Tuple[int, int]:
+    """
+    Convert a square index back into a (x, y) position on the board
+    """
+    return square & 7, square >> 3
+
+
+def square_name(square: int) -> str:
+    """
+    Return the name of the square in algebraic notation, like "e2"
+    """
+    return "abcdefgh"[square & 7] + str(8 - (square >> 3))
+
+
+def parse_square(name: str) -> int:
+    """
+    Return the square of its name in algebraic notation, like "e2"
+    """
+    return square_of("abcdefgh".index(name[0]), 8 - int(name[1]))
+
+
+def color_of(code: int) -> str:
+    """
+    Return the color of the piece stored with the given code
+    """
+    return COLORS[code >> 3]
+
+
+class Position:
+    """
+    Compact representation of the board.
+
+    Squares are stored in a fixed array of 64 piece codes, indexed by y * 8 + x.
+    The squares occupied by each color are tracked incrementally, both as a set and
+    as a bitboard, so the pieces of one side can be found without scanning the whole board.
+    A bitboard of each piece code is kept too, which tracks where the kings are.
+
+    Indexing it with a (x, y) tuple returns the shared Piece stored on that square,
+    so it can be used as a drop-in replacement for the old dict based grid.
+
+    The Zobrist key of the pieces, and the score of the board (positive when white
+    is ahead, as returned by calculate_total_score) are updated along with the squares.
+    """
+
+    squares: List[int]
+    pieces: Dict[str, Set[int]]
+    occupied: Dict[str, int]
+    bitboards: List[int]
+    key: int
+    score: float
+
+    __slots__ = ("squares", "pieces", "occupied", "bitboards", "key", "score")
+
+    def __init__(self):
+        self.squares = [EMPTY] * 64
+        self.pieces = {"white": set(), "black": set()}
+        self.occupied = {"white": 0, "black": 0}
+        self.bitboards = [0] * 16
+        self.key = 0
+        self.score = 0.0
+
+    def hash_key(self, color: str) -> int:
+        """
+        Return the Zobrist key of the position, with the given color to move
+        """
+        return self.key if color == "white" else self.key ^ ZOBRIST_BLACK_TO_MOVE
+
+    def king_square(self, color: str) -> Optional[int]:
+        """
+        Return the square of the king of the given color, or None if it isn't on the board
+        """
+        king = self.bitboards[KING | (BLACK_BIT if color == "black" else 0)]
+        return king.bit_length() - 1 if king else None
+
+    def put(self, square: int, code: int):
+        """
+        Place the piece with the given code on an empty square
+        """
+        color = COLORS[code >> 3]
+        self.squares[square] = code
+        self.pieces[color].add(square)
+        self.occupied[color] |= 1 << square
+        self.bitboards[code] |= 1 << square
+        self.key ^= ZOBRIST_PIECES[code][square]
+        self.score += SQUARE_SCORES[code][square]
+
+    def remove(self, square: int) -> int:
+        """
+        Remove the piece on the given square, and return its code
+        """
+        code = self.squares[square]
+        if code:
+            color = COLORS[code >> 3]
+            self.squares[square] = EMPTY
+            self.pieces[color].discard(square)
+            self.occupied[color] ^= 1 << square
+            self.bitboards[code] ^= 1 << square
+            self.key ^= ZOBRIST_PIECES[code][square]
+            self.score -= SQUARE_SCORES[code][square]
+        return code
+
+    def make_move(self, start: int, end: int) -> Undo:
+        """
+        Move the piece from the start square to the end square, capturing what is there.
+        Return the undo record that unmake_move needs to restore the position.
+        """
+        squares = self.squares
+        moved = squares[start]
+        captured = squares[end]
+        previous_key = key = self.key
+        previous_score = score = self.score
+        moved_keys = ZOBRIST_PIECES[moved]
+        moved_scores = SQUARE_SCORES[moved]
+
+        if captured:
+            captured_color = COLORS[captured >> 3]
+            self.pieces[captured_color].discard(end)
+            self.occupied[captured_color] ^= 1 << end
+            self.bitboards[captured] ^= 1 << end
+            key ^= ZOBRIST_PIECES[captured][end]
+            score -= SQUARE_SCORES[captured][end]
+        self.key = key ^ moved_keys[start] ^ moved_keys[end]
+        self.score = score + moved_scores[end] - moved_scores[start]
+
+        color = COLORS[moved >> 3]
+        own = self.pieces[color]
+        own.discard(start)
+        own.add(end)
+        self.occupied[color] ^= 1 << start | 1 << end
+        self.bitboards[moved] ^= 1 << start | 1 << end
+
+        squares[end] = moved
+        squares[start] = EMPTY
+
+        return start, end, moved, captured, previous_key, previous_score
+
+    def unmake_move(self, undo: Undo):
+        """
+        Revert a move done with make_move, using its undo record
+        """
+        (start, end, moved, captured, self.key, self.score) = undo
+        squares = self.squares
+
+        color = COLORS[moved >> 3]
+        own = self.pieces[color]
+        own.discard(end)
+        own.add(start)
+        self.occupied[color] ^= 1 << start | 1 << end
+        self.bitboards[moved] ^= 1 << start | 1 << end
+        squares[start] = moved
+
+        squares[end] = captured
+        if captured:
+            captured_color = COLORS[captured >> 3]
+            self.pieces[captured_color].add(end)
+            self.occupied[captured_color] |= 1 << end
+            self.bitboards[captured] |= 1 << end
+
+    def color_items(self, color: str) -> Iterator[Tuple[Tuple[int, int], Piece]]:
+        """
+        Iterate over the pieces of the given color
+        """
+        squares = self.squares
+        for square in self.pieces[color]:
+            yield (square & 7, square >> 3), PIECES[squares[square]]
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Piece]]:
+        """
+        Iterate over all the pieces on the board
+        """
+        yield from self.color_items("white")
+        yield from self.color_items("black")
+
+    def copy(self) -> "Position":
+        new = Position.__new__(Position)
+        new.squares = self.squares.copy()
+        new.pieces = {
+            "white": self.pieces["white"].copy(),
+            "black": self.pieces["black"].copy(),
+        }
+        new.occupied = self.occupied.copy()
+        new.bitboards = self.bitboards.copy()
+        new.key = self.key
+        new.score = self.score
+        return new
+
+    def clear(self):
+        self.squares = [EMPTY] * 64
+        self.pieces = {"white": set(), "black": set()}
+        self.occupied = {"white": 0, "black": 0}
+        self.bitboards = [0] * 16
+        self.key = 0
+        self.score = 0.0
+
+    def pop(self, pos: Tuple[int, int], default=None) -> Optional[Piece]:
+        """
+        Remove the piece at the given position and return it
+        """
+        code = self.remove(pos[1] * 8 + pos[0])
+        return PIECES[code] if code else default
+
+    def __getitem__(self, pos: Tuple[int, int]) -> Optional[Piece]:
+        return PIECES[self.squares[pos[1] * 8 + pos[0]]]
+
+    def __setitem__(self, pos: Tuple[int, int], piece: Optional[Piece]):
+        square = pos[1] * 8 + pos[0]
+        self.remove(square)
+        if piece is not None:
+            self.put(square, piece.code)
+
+    def __len__(self) -> int:
+        return len(self.pieces["white"]) + len(self.pieces["black"])
+
+    def __copy__(self) -> "Position":
+        return self.copy()
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Position) and self.squares == other.squares
+
+    __hash__ = None
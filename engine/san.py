@@ -0,0 +1,78 @@
+"""
+Standard Algebraic Notation of the moves, used by the PGN files.
+More information here: https://www.chessprogramming.org/Algebraic_Chess_Notation
+"""
+from typing import List, Optional, Tuple
+
+from .consts import PAWN
+from .movegen import legal_moves, is_in_check
+from .position import Position, square_name
+from .utils import enemy_color
+
+# Letters of the pieces in the notation, by kind.
+PIECE_NAMES = "?PNBRQK"
+
+
+def move_to_san(
+    grid: Position,
+    color: str,
+    move: Tuple[int, int],
+    moves: Optional[List[Tuple[int, int]]] = None,
+    checks: bool = True,
+) -> str:
+    """
+    Return the (start, end) move of the given color in the algebraic notation,
+    like "Nbd2" or "exd5+". The legal moves of the color can be given if known,
+    and the check and checkmate suffixes left out.
+    """
+    (start, end) = move
+    squares = grid.squares
+    kind = squares[start] & 7
+    capture = "x" if squares[end] else ""
+
+    if kind == PAWN:
+        # Pawn captures are named after the file the pawn comes from.
+        san = (square_name(start)[0] if capture else "") + capture + square_name(end)
+    else:
+        if moves is None:
+            moves = legal_moves(grid, color)
+        # Other pieces of the same type that can go to the same square.
+        others = [
+            s
+            for (s, e) in moves
+            if e == end and s != start and squares[s] == squares[start]
+        ]
+        origin = ""
+        if others:
+            if all(s & 7 != start & 7 for s in others):
+                origin = square_name(start)[0]
+            elif all(s >> 3 != start >> 3 for s in others):
+                origin = square_name(start)[1]
+            else:
+                origin = square_name(start)
+        san = PIECE_NAMES[kind] + origin + capture + square_name(end)
+
+    if not checks:
+        return san
+
+    undo = grid.make_move(start, end)
+    enemy = enemy_color(color)
+    if is_in_check(grid, enemy):
+        san += "+" if legal_moves(grid, enemy) else "#"
+    grid.unmake_move(undo)
+
+    return san
+
+
+def parse_san(grid: Position, color: str, san: str) -> Optional[Tuple[int, int]]:
+    """
+    Return the (start, end) move of the given color written in the algebraic notation,
+    or None if it isn't a legal move, like the castlings and promotions of this game
+    """
+    # The check suffixes and annotations don't change the move.
+    san = san.rstrip("+#!?")
+    moves = legal_moves(grid, color)
+    for move in moves:
+        if move_to_san(grid, color, move, moves, checks=False) == san:
+            return move
+    return None
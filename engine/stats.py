@@ -0,0 +1,86 @@
+"""
+Statistics of the searches of the bot, to follow its performance and compare builds.
+
+After each move, the bot keeps them in Bot.stats, passes them to Bot.on_stats
+if it is set, and appends them as a JSON line to the Bot.stats_log file if it is set.
+"""
+import json
+from math import isinf
+from typing import Any, Dict
+
+
+class SearchStats:
+    """
+    Statistics of one move of the bot
+    """
+
+    __slots__ = (
+        # Where the move comes from: "search", "book" or "tablebase"
+        "source",
+        "color",
+        # Move, principal variation and score of the last completed iteration,
+        # in the long algebraic notation
+        "move",
+        "pv",
+        "score",
+        # Depth of the last completed iteration
+        "depth",
+        # Nodes searched, the ones of the quiescence search among them,
+        # and the nodes of each helper process
+        "nodes",
+        "quiescence_nodes",
+        "helper_nodes",
+        # Time of the move in seconds, and nodes searched per second
+        "time",
+        "nps",
+        # Nodes and time in seconds of each completed iteration
+        "iteration_nodes",
+        "iteration_times",
+        "cutoffs",
+        "first_move_cutoff_rate",
+        "null_move_cutoffs",
+        "reductions",
+        "researches",
+        "aspiration_failures",
+        "tt_probes",
+        "tt_hits",
+        # Moves tested for leaving the king in check, in the search and in the
+        # quiescence search
+        "legality_checks",
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_json(self) -> str:
+        """
+        Return the statistics as a line of JSON, with the infinite scores (if any)
+        as "mate" or "-mate" since JSON has no infinity
+        """
+        values = self.as_dict()
+        if values["score"] is not None and isinf(values["score"]):
+            values["score"] = "mate" if values["score"] > 0 else "-mate"
+        return json.dumps(values)
+
+    def summary(self) -> str:
+        """
+        Return the main statistics on one line, for the console
+        """
+        text = f"Bot took {self.time:.3f} seconds to play {self.move}"
+        if self.source != "search":
+            return f"{text} from the {self.source}"
+        return (
+            f"{text}, depth {self.depth}, {self.nodes} nodes "
+            f"({self.quiescence_nodes} in quiescence), {self.nps:.0f} nodes/s"
+        )
+
+    def write(self, path: str):
+        """
+        Append the statistics to the JSON lines file
+        """
+        with open(path, "a") as file:
+            file.write(self.to_json() + "\n")
@@ -0,0 +1,428 @@
+"""
+Endgame tablebases, the exact result of every position with a few pieces against
+a lone king, like KQK or KBNK.
+
+The tables are generated by retrograde analysis: starting from the checkmates,
+the positions are solved backward, one ply further from the mate at a time.
+A position of the side with the pieces is won as soon as one of its moves leads to
+a lost position, and a position of the lone king is lost once all its moves lead
+to won positions. The positions left are draws.
+More information here: https://www.chessprogramming.org/Retrograde_Analysis
+
+Each table stores a byte per position: 0 for a draw (or a position that can't
+happen), and otherwise 1 + the distance to the mate in plies. The side with the
+pieces is always stored as white, and its king is brought into a corner of the
+board by the symmetries, so only 10 of its squares are stored (32 with pawns,
+which can only be mirrored along the files).
+The files are mapped in memory, so opening them reads nothing.
+"""
+import mmap
+import os
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .consts import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from .movegen import KING_ATTACKS, attacks, iter_squares
+from .position import Position
+
+# Letters of the pieces in the names of the tables, by kind
+PIECE_LETTERS = "?PNBRQK"
+# Order of the pieces in the names, the most valuable first
+NAME_ORDER = (QUEEN, ROOK, BISHOP, KNIGHT, PAWN)
+
+# Tables generated by default, the smaller ones first
+DEFAULT_TABLES = ("KQK", "KRK", "KPK", "KBNK")
+# Largest number of pieces on the board covered by the tables
+MAX_PIECES = 4
+# Extension of the files of the tables
+EXTENSION = ".tb"
+
+# Results of a position, for the side to move
+WIN, DRAW, LOSS = 1, 0, -1
+
+# Value of the positions that aren't known to be lost yet, but have a draw
+DRAWN = 0xFF
+
+
+def _symmetry(flip_x: bool, flip_y: bool, swap: bool) -> List[int]:
+    """
+    Return the square where each square goes by the symmetry
+    """
+    table = []
+    for square in range(64):
+        (x, y) = (square & 7, square >> 3)
+        if swap:
+            (x, y) = (y, x)
+        if flip_x:
+            x = 7 - x
+        if flip_y:
+            y = 7 - y
+        table.append(y * 8 + x)
+    return table
+
+
+# The 8 symmetries of the board, the identity first.
+# With pawns, which only move forward, only the mirror along the files keeps the moves.
+SYMMETRIES = [
+    _symmetry(flip_x, flip_y, swap)
+    for swap in (False, True)
+    for flip_y in (False, True)
+    for flip_x in (False, True)
+]
+PAWN_SYMMETRIES = SYMMETRIES[:2]
+
+# Squares where the king of the side with the pieces is stored
+KING_REGION = [y * 8 + x for y in range(4) for x in range(y + 1)]
+PAWN_KING_REGION = [y * 8 + x for y in range(8) for x in range(4)]
+
+
+def parse_name(name: str) -> List[int]:
+    """
+    Return the kinds of the pieces of the table with the given name, like "KBNK",
+    besides the kings
+    """
+    letters = name.upper()
+    if len(letters) < 3 or letters[0] != "K" or letters[-1] != "K":
+        raise ValueError(f"invalid table name: {name}")
+
+    kinds = []
+    for letter in letters[1:-1]:
+        kind = PIECE_LETTERS.find(letter)
+        if kind not in NAME_ORDER:
+            raise ValueError(f"invalid piece in the table name: {letter}")
+        kinds.append(kind)
+    if len(set(kinds)) != len(kinds):
+        raise ValueError("tables with two pieces of the same kind aren't supported")
+    if len(kinds) + 2 > MAX_PIECES:
+        raise ValueError(f"tables are limited to {MAX_PIECES} pieces")
+    return sorted(kinds, key=NAME_ORDER.index)
+
+
+def table_name(kinds: Sequence[int]) -> str:
+    """
+    Return the name of the table of the given kinds of pieces, like "KBNK"
+    """
+    return "K" + "".join(PIECE_LETTERS[kind] for kind in kinds) + "K"
+
+
+class Table:
+    """
+    Table of a set of pieces, with the positions indexed as
+    (side to move, king, enemy king, pieces in the order of the name)
+    """
+
+    def __init__(self, name: str, data=None):
+        self.kinds = parse_name(name)
+        self.name = table_name(self.kinds)
+
+        pawns = PAWN in self.kinds
+        self.region = PAWN_KING_REGION if pawns else KING_REGION
+        self.king_index = [-1] * 64
+        for (index, square) in enumerate(self.region):
+            self.king_index[square] = index
+        # Symmetries bringing the king of each square into the region, two of them
+        # when it is on the diagonal of the corner.
+        self.king_symmetries = [
+            [
+                symmetry
+                for symmetry in (PAWN_SYMMETRIES if pawns else SYMMETRIES)
+                if self.king_index[symmetry[square]] >= 0
+            ]
+            for square in range(64)
+        ]
+
+        self.bits = 6 * len(self.kinds)
+        self.size = 2 * len(self.region) * 64 << self.bits
+        self.data = data
+        self.file = None
+
+    @classmethod
+    def open(cls, path: str) -> "Table":
+        """
+        Map the table of the given file in memory
+        """
+        name = os.path.splitext(os.path.basename(path))[0]
+        table = cls(name)
+        table.file = open(path, "rb")
+        size = table.file.seek(0, 2)
+        if size != table.size:
+            table.file.close()
+            raise ValueError(f"{path} has {size} bytes instead of {table.size}")
+        table.data = mmap.mmap(table.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return table
+
+    def close(self):
+        if self.file:
+            self.data.close()
+            self.file.close()
+            self.file = None
+
+    def index(self, color: int, king: int, enemy_king: int, squares) -> int:
+        """
+        Return the index of the position, with color 0 when the side with the pieces
+        is to move. Positions equal by symmetry get the same (smallest) index.
+        """
+        best = -1
+        for symmetry in self.king_symmetries[king]:
+            index = (color * len(self.region) + self.king_index[symmetry[king]]) * 64
+            index += symmetry[enemy_king]
+            for square in squares:
+                index = index << 6 | symmetry[square]
+            if best < 0 or index < best:
+                best = index
+        return best
+
+    def decode(self, index: int) -> Tuple[int, int, int, List[int]]:
+        """
+        Return the (color, king, enemy king, squares) of the position at the index
+        """
+        squares = [index >> shift & 63 for shift in range(self.bits - 6, -6, -6)]
+        index >>= self.bits
+        (color, king_index) = divmod(index >> 6, len(self.region))
+        return color, self.region[king_index], index & 63, squares
+
+    def result(self, color: int, king: int, enemy_king: int, squares):
+        """
+        Return the (result, plies to the mate) of the position for the side to move
+        """
+        value = self.data[self.index(color, king, enemy_king, squares)]
+        if not value:
+            return DRAW, 0
+        return (LOSS if color else WIN), value - 1
+
+
+def is_attacked(square: int, king: int, kinds, squares, occupied: int) -> bool:
+    """
+    Check if the square is attacked by the king and the pieces of the given kinds
+    """
+    if KING_ATTACKS[king] >> square & 1:
+        return True
+    for (kind, start) in zip(kinds, squares):
+        if attacks(kind, start, occupied) >> square & 1:
+            return True
+    return False
+
+
+def generate_table(name: str, tables: Optional[Dict[str, Table]] = None) -> Table:
+    """
+    Solve all the positions of the table with the given name.
+    The captures of the lone king lead to the smaller tables, when they are given,
+    and are draws otherwise.
+    """
+    table = Table(name)
+    kinds = table.kinds
+    count = len(kinds)
+    tables = tables or {}
+    index_of = table.index
+
+    values = bytearray(table.size)
+    half = table.size // 2
+    # Number of moves of each position of the lone king that aren't known to lose yet,
+    # and longest mate of its captures, when they all lose.
+    counts = bytearray(half)
+    floors: Dict[int, int] = {}
+    # Positions solved at each distance to the mate, to solve their parents next
+    queue: List[List[int]] = [[] for _ in range(256)]
+
+    # Find the mates, and count the moves of the other positions of the lone king.
+    index = half
+    for king in table.region:
+        for enemy_king in range(64):
+            for squares in product(range(64), repeat=count):
+                position = index
+                index += 1
+                if enemy_king == king or KING_ATTACKS[king] >> enemy_king & 1:
+                    continue
+                if len({king, enemy_king, *squares}) != count + 2:
+                    continue
+                # Equal positions are only solved once, under their smallest index.
+                if len(table.king_symmetries[king]) > 1:
+                    if index_of(1, king, enemy_king, squares) != position:
+                        continue
+
+                # The enemy king doesn't block the attacks along the lines it flees.
+                occupied = 1 << king
+                for square in squares:
+                    occupied |= 1 << square
+                attacked = KING_ATTACKS[king]
+                for (kind, square) in zip(kinds, squares):
+                    attacked |= attacks(kind, square, occupied)
+
+                targets = KING_ATTACKS[enemy_king] & ~attacked
+                if not targets:
+                    if attacked >> enemy_king & 1:
+                        values[position] = 1
+                        queue[0].append(position)
+                    else:
+                        counts[position - half] = DRAWN
+                    continue
+
+                children = set()
+                floor = 0
+                for target in iter_squares(targets):
+                    if target not in squares:
+                        children.add(index_of(0, king, target, squares))
+                        continue
+                    # The captured piece leads to the table without it.
+                    captured = squares.index(target)
+                    rest = kinds[:captured] + kinds[captured + 1 :]
+                    smaller = tables.get(table_name(rest))
+                    result = DRAW
+                    if smaller is not None:
+                        rest_squares = squares[:captured] + squares[captured + 1 :]
+                        (result, plies) = smaller.result(0, king, target, rest_squares)
+                    if result == DRAW:
+                        floor = -1
+                        break
+                    floor = max(floor, plies)
+
+                if floor < 0:
+                    counts[position - half] = DRAWN
+                elif not children:
+                    values[position] = floor + 2
+                    queue[floor + 1].append(position)
+                else:
+                    counts[position - half] = len(children)
+                    if floor:
+                        floors[position] = floor
+
+    for distance in range(255):
+        for position in queue[distance]:
+            (color, king, enemy_king, squares) = table.decode(position)
+            occupied = 1 << king | 1 << enemy_king
+            for square in squares:
+                occupied |= 1 << square
+
+            if color:
+                # Lost with the lone king to move: the positions where a piece moves
+                # here are won.
+                parents = []
+                for origin in iter_squares(
+                    KING_ATTACKS[king] & ~occupied & ~KING_ATTACKS[enemy_king]
+                ):
+                    parents.append((origin, squares))
+                for (piece, (kind, square)) in enumerate(zip(kinds, squares)):
+                    if kind == PAWN:
+                        origins = 0
+                        # Pawns go up the board, so they come from below.
+                        if square < 48 and not occupied >> (square + 8) & 1:
+                            origins = 1 << (square + 8)
+                            if square >> 3 == 4 and not occupied >> (square + 16) & 1:
+                                origins |= 1 << (square + 16)
+                    else:
+                        origins = attacks(kind, square, occupied) & ~occupied
+                    for origin in iter_squares(origins):
+                        moved = list(squares)
+                        moved[piece] = origin
+                        parents.append((king, moved))
+
+                for (parent_king, parent_squares) in parents:
+                    parent_occupied = 1 << parent_king | 1 << enemy_king
+                    for square in parent_squares:
+                        parent_occupied |= 1 << square
+                    # The lone king can't be in check with the other side to move.
+                    if is_attacked(
+                        enemy_king, parent_king, kinds, parent_squares, parent_occupied
+                    ):
+                        continue
+                    parent = index_of(0, parent_king, enemy_king, parent_squares)
+                    if not values[parent]:
+                        values[parent] = distance + 2
+                        queue[distance + 1].append(parent)
+            else:
+                # Won with the pieces to move: the positions where the lone king
+                # moves here lose once all their moves do.
+                parents = set()
+                for origin in iter_squares(
+                    KING_ATTACKS[enemy_king] & ~occupied & ~KING_ATTACKS[king]
+                ):
+                    parents.add(index_of(1, king, origin, squares))
+                for parent in parents:
+                    remaining = counts[parent - half]
+                    if values[parent] or remaining == DRAWN:
+                        continue
+                    counts[parent - half] = remaining - 1
+                    if remaining == 1:
+                        plies = max(distance, floors.get(parent, 0)) + 1
+                        values[parent] = plies + 1
+                        queue[plies].append(parent)
+
+    table.data = values
+    return table
+
+
+def write_table(path: str, table: Table):
+    """
+    Write the generated table to the file
+    """
+    with open(path, "wb") as file:
+        file.write(table.data)
+
+
+class Tablebases:
+    """
+    Tables of a directory, opened on their first probe
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.tables: Dict[str, Optional[Table]] = {}
+
+    def table(self, name: str) -> Optional[Table]:
+        """
+        Return the table with the given name, or None if it isn't in the directory
+        """
+        if name not in self.tables:
+            path = os.path.join(self.directory, name + EXTENSION)
+            self.tables[name] = Table.open(path) if os.path.exists(path) else None
+        return self.tables[name]
+
+    def close(self):
+        for table in self.tables.values():
+            if table:
+                table.close()
+        self.tables = {}
+
+    def probe(self, grid: Position, color: str) -> Optional[Tuple[int, int]]:
+        """
+        Return the (result, plies to the mate) of the position for the color to move,
+        or None if no table covers it
+        """
+        pieces = grid.pieces
+        if len(pieces["white"]) + len(pieces["black"]) > MAX_PIECES:
+            return None
+        if len(pieces["black"]) == 1:
+            (strong, weak, flip) = ("white", "black", 0)
+        elif len(pieces["white"]) == 1:
+            # The tables are stored with white having the pieces, so the board is
+            # flipped vertically, which also turns the black pawns into white ones.
+            (strong, weak, flip) = ("black", "white", 56)
+        else:
+            return None
+
+        squares = grid.squares
+        king = grid.king_square(strong)
+        weak_king = grid.king_square(weak)
+        if king is None or weak_king is None:
+            return None
+        others = sorted(
+            (NAME_ORDER.index(squares[square] & 7), square ^ flip)
+            for square in pieces[strong]
+            if square != king
+        )
+        if not others:
+            # Two lone kings
+            return DRAW, 0
+
+        kinds = [NAME_ORDER[order] for (order, _) in others]
+        if len(set(kinds)) != len(kinds) or KING in kinds:
+            return None
+        table = self.table(table_name(kinds))
+        if table is None:
+            return None
+        return table.result(
+            0 if color == strong else 1,
+            king ^ flip,
+            weak_king ^ flip,
+            [square for (_, square) in others],
+        )
@@ -0,0 +1,204 @@
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Tuple
+
+# Bound types of the stored scores.
+# More information here: https://www.chessprogramming.org/Transposition_Table
+EXACT = 0
+# The real score is at least the stored one (the search failed high).
+LOWER = 1
+# The real score is at most the stored one (the search failed low).
+UPPER = 2
+
+# Size in bytes of an entry: key (8), score (8), move (2), depth (1), bound (1), age (1).
+ENTRY_SIZE = 21
+# Name, type code and size in bytes of each field of the entries.
+FIELDS = (
+    ("keys", "Q", 8),
+    ("scores", "d", 8),
+    ("moves", "H", 2),
+    ("depths", "b", 1),
+    ("bounds", "B", 1),
+    ("ages", "B", 1),
+)
+
+
+def entry_count(size_mb: int) -> int:
+    """
+    Return the number of entries of a table using the given amount of memory
+    """
+    count = max(1, size_mb * 1024 * 1024 // ENTRY_SIZE)
+    # Round the number of entries down to a power of two,
+    # so the index of a key is a simple mask of its lower bits.
+    return 1 << (count.bit_length() - 1)
+
+
+class TranspositionTable:
+    """
+    Fixed size table of the positions already searched, indexed by their Zobrist key.
+
+    Each field of the entries is stored in its own typed array,
+    so the table takes the same amount of memory whatever it contains.
+
+    When two positions fall on the same entry, the new one replaces the old one,
+    unless the stored entry comes from the current search and was searched deeper.
+
+    A shared table lives in a shared memory block, so the processes of a parallel
+    search can read and write the same entries (see parallel.py).
+    Its entries are written without any lock: two processes storing the same entry
+    at the same time can mix their fields, which is rare enough to be accepted.
+    """
+
+    def __init__(self, size_mb: int = 16, shared: bool = False):
+        self.size_mb = size_mb
+        self.shared = shared
+        self.memory = None
+        self.owner = shared
+        self.resize(size_mb)
+
+    @classmethod
+    def attach(cls, name: str, size_mb: int) -> "TranspositionTable":
+        """
+        Open the shared table created by another process under the given name
+        """
+        table = cls.__new__(cls)
+        table.size_mb = size_mb
+        table.shared = True
+        table.memory = SharedMemory(name)
+        # The process that created the table is the one that removes it.
+        table.owner = False
+        table.map(table.memory.buf, entry_count(size_mb))
+        table.age = 0
+        table.reset_stats()
+        return table
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        Name of the shared memory block of the table, None if it isn't shared
+        """
+        return self.memory.name if self.memory else None
+
+    def resize(self, size_mb: int):
+        """
+        Reallocate the table to use the given amount of memory, which clears it
+        """
+        self.size_mb = size_mb
+        count = entry_count(size_mb)
+
+        if self.shared:
+            self.close()
+            self.memory = SharedMemory(create=True, size=ENTRY_SIZE * count)
+            self.map(self.memory.buf, count)
+        else:
+            for (name, code, size) in FIELDS:
+                setattr(self, name, array(code, bytes(size * count)))
+        self.mask = count - 1
+
+        self.age = 0
+        self.reset_stats()
+
+    def map(self, buffer, count: int):
+        """
+        Use the buffer to store the fields of the given number of entries
+        """
+        self.mask = count - 1
+        offset = 0
+        for (name, code, size) in FIELDS:
+            setattr(self, name, buffer[offset : offset + size * count].cast(code))
+            offset += size * count
+
+    def close(self):
+        """
+        Release the shared memory of the table, removing it if this process created it
+        """
+        if self.memory is None:
+            return
+        # The views on the memory must be released before closing it.
+        for (name, _, _) in FIELDS:
+            getattr(self, name).release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+        self.memory = None
+
+    def __del__(self):
+        self.close()
+
+    def clear(self):
+        if self.memory is None:
+            self.resize(self.size_mb)
+            return
+        # Keep the same shared memory block, so the other processes still use it.
+        size = ENTRY_SIZE * len(self)
+        self.memory.buf[:size] = bytes(size)
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """
+        Mark the entries stored until now as coming from a previous search
+        """
+        self.age = (self.age + 1) & 0xFF
+
+    def __len__(self):
+        return self.mask + 1
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def usage(self, sample: int = 1000) -> float:
+        """
+        Estimate the fraction of the table that is filled, from its first entries
+        """
+        sample = min(sample, len(self))
+        return sum(1 for key in self.keys[:sample] if key) / sample
+
+    def probe(self, key: int) -> Optional[Tuple[int, float, int, int]]:
+        """
+        Return the (depth, score, bound, move) stored for the key, or None
+        """
+        self.probes += 1
+        index = key & self.mask
+        if self.keys[index] != key:
+            return None
+
+        self.hits += 1
+        return (
+            self.depths[index],
+            self.scores[index],
+            self.bounds[index],
+            self.moves[index],
+        )
+
+    def store(self, key: int, depth: int, score: float, bound: int, move: int):
+        """
+        Store the result of the search of a position
+        """
+        index = key & self.mask
+
+        # Replacement policy: keep deeper results of the current search.
+        if (
+            self.keys[index] != key
+            and self.ages[index] == self.age
+            and self.depths[index] > depth
+        ):
+            return
+
+        # Keep the previous best move if the new search didn't find one.
+        if not move and self.keys[index] == key:
+            move = self.moves[index]
+
+        self.stores += 1
+        self.keys[index] = key
+        self.scores[index] = score
+        self.moves[index] = move
+        self.depths[index] = depth
+        self.bounds[index] = bound
+        self.ages[index] = self.age
@@ -0,0 +1,24 @@
+from .piece import PIECES
+from .position import Position
+
+
+def enemy_color(color: str):
+    if color == "black":
+        return "white"
+    else:
+        return "black"
+
+
+def calculate_total_score(grid: Position):
+    """
+    Compute the score of the whole grid from scratch.
+    The search uses grid.score instead, which is updated on each move.
+    """
+    total_score = 0
+    squares = grid.squares
+    for square in grid.pieces["white"]:
+        total_score += PIECES[squares[square]].get_score(square & 7, square >> 3)
+    for square in grid.pieces["black"]:
+        total_score -= PIECES[squares[square]].get_score(square & 7, square >> 3)
+
+    return total_score
@@ -0,0 +1,30 @@
+from tkinter import PhotoImage
+
+from engine.piece import Piece
+
+# Images of the pieces, loaded once for each type and color
+photo = {}
+
+
+def image_path(piece: Piece) -> str:
+    return f"./images/{type(piece).__name__.lower()}_{piece.color}.png"
+
+
+def piece_image(piece: Piece, cell_size: int) -> PhotoImage:
+    """
+    Return the image of the piece, scaled to the size of the cells
+    """
+    # Check if image is in cache, if not load it
+    name = type(piece).__name__
+    if name not in photo:
+        photo[name] = {"black": None, "white": None}
+    if photo[name][piece.color] is None:
+        # Load image from file
+        image = PhotoImage(file=image_path(piece))
+
+        # Resize image to the correct scale
+        photo[name][piece.color] = image.subsample(
+            image.width() // cell_size, image.height() // cell_size
+        )
+
+    return photo[name][piece.color]
@@ -1,6 +1,14 @@
-from tkinter import Tk, Frame, Canvas, BOTH, Event, messagebox, Menu
+"""
+Chess game against a friend or the bot, in a window.
+
+Usage: python main.py [--profile DIRECTORY] [--profile-mode {sample,cprofile}]
+                      [--profile-memory]
+"""
+from argparse import ArgumentParser
+from tkinter import Tk, Frame, Canvas, BOTH, Event, TclError, messagebox, Menu
 from board import Board
-from consts import WIDTH, HEIGHT
+from consts import WIDTH, HEIGHT, BOT_LEVELS
+from profiling import add_profile_arguments, profile_game, profiler_from_arguments
 
 
 class MainGUI(Frame):
@@ -22,20 +30,15 @@ class MainGUI(Frame):
         settings_menu = Menu(menubar, tearoff=0)
         settings_menu.add_command(label="Restart", command=self.restart_dialog)
         settings_menu.add_command(label="Enable Bot", command=self.bot_dialog)
+        settings_menu.add_command(label="Copy FEN", command=self.copy_fen)
+        settings_menu.add_command(label="Paste FEN", command=self.paste_fen)
 
         levels = Menu(menubar, tearoff=0)
-        levels.add_command(
-            label="Level 2 (0.01s)", command=lambda: self.select_bot_difficulty(2)
-        )
-        levels.add_command(
-            label="Level 3 (0.05s)", command=lambda: self.select_bot_difficulty(3)
-        )
-        levels.add_command(
-            label="Level 4 (0.5s)", command=lambda: self.select_bot_difficulty(4)
-        )
-        levels.add_command(
-            label="Level 5 (2s)", command=lambda: self.select_bot_difficulty(5)
-        )
+        for (level, time_limit) in BOT_LEVELS.items():
+            levels.add_command(
+                label=f"Level {level} ({time_limit}s)",
+                command=lambda level=level: self.select_bot_difficulty(level),
+            )
         settings_menu.add_cascade(label="Bot Difficulty", menu=levels)
 
         settings_menu.add_separator()
@@ -72,6 +75,24 @@ class MainGUI(Frame):
             "Game Mode", "Do you want to play with a bot?"
         )
 
+        if not self.board.playWithBot:
+            self.board.cancel_bot_search()
+        elif self.board.player == "black" and not self.board.is_bot_searching():
+            # The bot plays black, let it play if it is its turn.
+            self.board.start_bot_search()
+
+    def copy_fen(self):
+        self.clipboard_clear()
+        self.clipboard_append(self.board.to_fen())
+
+    def paste_fen(self):
+        try:
+            self.board.load_fen(self.clipboard_get())
+        except (TclError, ValueError) as error:
+            messagebox.showerror(
+                "Paste FEN", f"The clipboard has no valid FEN:\n{error}"
+            )
+
     def open_about(self):
         self.board.playWithBot = messagebox.showinfo(
             "Info",
@@ -83,7 +104,12 @@ class MainGUI(Frame):
         )
 
     def select_bot_difficulty(self, difficulty: int):
-        self.board.bot.depth = difficulty
+        # Each level gives the bot a time budget to search as deep as it can.
+        self.board.bot.time_limit = BOT_LEVELS[difficulty]
+
+        # Restart the current search, if any, with the new budget.
+        if self.board.is_bot_searching():
+            self.board.start_bot_search()
 
     def on_mouse_down(self, click_event: Event):
         self.board.handle_drag_start(click_event)
@@ -95,7 +121,19 @@ class MainGUI(Frame):
         self.board.on_mouse_move(motion)
 
 
-root = Tk()
-gui = MainGUI()
+# The window is only created when the game is run, not when the module is imported
+# (by the processes of the parallel search, for example).
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Play chess against a friend or the bot.")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    root = Tk()
+    gui = MainGUI()
+
+    profiler = profiler_from_arguments(args)
+    if profiler:
+        profile_game(profiler, gui.board)
+
+    root.mainloop()
 
-root.mainloop()
@@ -0,0 +1,410 @@
+"""
+Self-play match between two configurations of the bot, run without any window.
+
+The games start from a list of openings, each of them played twice with the colors
+swapped, and are spread over a pool of processes. The games are saved in a PGN file,
+and the result is given as an Elo difference, with an optional sequential
+probability ratio test (SPRT) to stop the match once one of the engines is
+known to be better.
+More information here: https://www.chessprogramming.org/Match_Statistics
+
+The engines are configured with comma separated attributes of the bot, like
+"time_limit=0.05,hash_size_mb=32".
+
+Usage: python match.py [--games GAMES] [--workers WORKERS] [--time SECONDS]
+                       [--nodes NODES] [--depth DEPTH] [--engine-a OPTIONS]
+                       [--engine-b OPTIONS] [--openings FILE] [--pgn FILE]
+                       [--max-plies PLIES] [--sprt] [--elo0 ELO] [--elo1 ELO]
+                       [--alpha ALPHA] [--beta BETA]
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from math import log, log10, sqrt
+from multiprocessing.util import Finalize
+from typing import Dict, List, Optional, Tuple
+
+from consts import BOT_MAX_DEPTH
+from engine.bot import Bot
+from engine.fen import INITIAL_FEN, parse_fen
+from engine.movegen import legal_moves, is_in_check
+from engine.position import parse_square, square_of
+from engine.san import move_to_san
+from engine.utils import enemy_color
+
+# Openings of the games, as moves in the long algebraic notation.
+OPENINGS = [
+    "e2e4 e7e5 g1f3 b8c6",
+    "e2e4 c7c5 g1f3 d7d6",
+    "e2e4 e7e6 d2d4 d7d5",
+    "e2e4 c7c6 d2d4 d7d5",
+    "d2d4 d7d5 c2c4 e7e6",
+    "d2d4 g8f6 c2c4 g7g6",
+    "d2d4 g8f6 c2c4 e7e6",
+    "c2c4 e7e5 b1c3 g8f6",
+    "g1f3 d7d5 g2g3 g8f6",
+    "e2e4 d7d5 e4d5 d8d5",
+    "d2d4 f7f5 g2g3 g8f6",
+    "e2e4 g7g6 d2d4 f8g7",
+]
+
+# Number of plies after which a game is adjudicated as a draw
+MAX_PLIES = 200
+
+# Results of the games, in the PGN notation
+WHITE_WINS = "1-0"
+BLACK_WINS = "0-1"
+DRAW = "1/2-1/2"
+
+# Bot of each engine, by its index and its options, kept by the worker processes
+# between their games
+_bots: Dict[Tuple[int, str], Bot] = {}
+
+
+def parse_options(options: str) -> Dict[str, str]:
+    """
+    Parse the "name=value,name=value" options of an engine
+    """
+    return dict(
+        option.split("=", 1) for option in options.split(",") if "=" in option
+    )
+
+
+def configure_bot(bot: Bot, options: Dict[str, str]):
+    """
+    Set the attributes of the bot from their text value
+    """
+    for (name, value) in options.items():
+        # The size of the table and the helper processes need more than the attribute.
+        if name == "hash_size_mb":
+            bot.set_hash_size(int(value))
+            continue
+        if name == "workers":
+            bot.set_workers(int(value))
+            continue
+        if not hasattr(bot, name):
+            raise ValueError(f"the bot has no {name} option")
+
+        current = getattr(bot, name)
+        if value.lower() == "none":
+            setattr(bot, name, None)
+        elif isinstance(current, bool):
+            setattr(bot, name, value.lower() in ("1", "true", "yes", "on"))
+        elif isinstance(current, int) or (current is None and value.isdigit()):
+            setattr(bot, name, int(value))
+        elif isinstance(current, str) or name == "stats_log":
+            setattr(bot, name, value)
+        else:
+            setattr(bot, name, float(value))
+
+
+def close_bot(bot: Bot):
+    """
+    Stop the helper processes of the bot and release its transposition table
+    """
+    bot.close()
+    bot.tt.close()
+
+
+def get_bot(engine: int, options: str) -> Bot:
+    """
+    Return the bot of the worker process for the engine with the given index,
+    configured with the options. Engines with the same options still get their
+    own bot, so they don't share their tables.
+    """
+    if (engine, options) not in _bots:
+        bot = Bot(None, BOT_MAX_DEPTH)
+        configure_bot(bot, parse_options(options))
+        _bots[engine, options] = bot
+        # The helpers and the shared table are released when the worker exits.
+        Finalize(bot, close_bot, args=(bot,), exitpriority=10)
+    return _bots[engine, options]
+
+
+def play_game(
+    opening: str,
+    white: str,
+    black: str,
+    max_plies: int = MAX_PLIES,
+    white_engine: int = 0,
+) -> Tuple[str, str, List[str]]:
+    """
+    Play a game between the engines with the given options, from the opening,
+    the engine with the given index (0 or 1) playing white.
+    Return its result, the reason of the end of the game, and its moves in
+    the algebraic notation.
+    """
+    (grid, color) = parse_fen(INITIAL_FEN)
+    bots = {
+        "white": get_bot(white_engine, white),
+        "black": get_bot(1 - white_engine, black),
+    }
+    # The results of the previous game don't apply to this one.
+    for bot in bots.values():
+        bot.tt.clear()
+
+    sans = []
+    # Number of times each position was reached, to detect the repetitions
+    seen = {}
+    for move in opening.split():
+        (start, end) = (parse_square(move[:2]), parse_square(move[2:4]))
+        sans.append(move_to_san(grid, color, (start, end)))
+        grid.make_move(start, end)
+        color = enemy_color(color)
+
+    while True:
+        moves = legal_moves(grid, color)
+        if not moves:
+            if is_in_check(grid, color):
+                winner = WHITE_WINS if color == "black" else BLACK_WINS
+                return winner, "checkmate", sans
+            return DRAW, "stalemate", sans
+
+        key = grid.hash_key(color)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] >= 3:
+            return DRAW, "repetition", sans
+        # Only the kings are left.
+        if len(grid) == 2:
+            return DRAW, "insufficient material", sans
+        if len(sans) >= max_plies:
+            return DRAW, "adjudication", sans
+
+        best = bots[color].play(color, grid)
+        (start, end) = (square_of(*best[0]), square_of(*best[1]))
+        sans.append(move_to_san(grid, color, (start, end), moves))
+        grid.make_move(start, end)
+        color = enemy_color(color)
+
+
+def format_pgn(
+    round_number: int,
+    white: str,
+    black: str,
+    result: str,
+    termination: str,
+    sans: List[str],
+) -> str:
+    """
+    Return the game in the PGN notation
+    """
+    tags = {
+        "Event": "Self-play match",
+        "Site": "py-chess-tk",
+        "Date": date.today().strftime("%Y.%m.%d"),
+        "Round": str(round_number),
+        "White": white or "default",
+        "Black": black or "default",
+        "Result": result,
+        "Termination": termination,
+    }
+    lines = [f'[{name} "{value}"]' for (name, value) in tags.items()]
+
+    words = []
+    for (ply, san) in enumerate(sans):
+        if ply % 2 == 0:
+            words.append(f"{ply // 2 + 1}.")
+        words.append(san)
+    words.append(result)
+
+    # Lines of the moves are limited to 80 characters.
+    text = ""
+    movetext = []
+    for word in words:
+        if text and len(text) + 1 + len(word) > 80:
+            movetext.append(text)
+            text = word
+        else:
+            text = f"{text} {word}" if text else word
+    movetext.append(text)
+
+    return "\n".join(lines) + "\n\n" + "\n".join(movetext) + "\n\n"
+
+
+def score_statistics(wins: int, losses: int, draws: int) -> Tuple[float, float]:
+    """
+    Return the average score of a game, and the variance of the score of a game
+    """
+    games = wins + losses + draws
+    if not games:
+        return 0.5, 0.0
+    score = (wins + draws / 2) / games
+    variance = (
+        wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score**2
+    ) / games
+    return score, variance
+
+
+def elo_difference(wins: int, losses: int, draws: int) -> Tuple[float, float]:
+    """
+    Return the Elo difference given by the results, and its 95% error margin
+    """
+    games = wins + losses + draws
+    if not games:
+        return 0.0, 0.0
+
+    (score, variance) = score_statistics(wins, losses, draws)
+    if score in (0.0, 1.0):
+        return (-1 if score == 0 else 1) * float("inf"), float("inf")
+
+    def elo(score: float) -> float:
+        return -400 * log10(1 / score - 1)
+
+    deviation = sqrt(variance / games)
+    low = min(max(score - 1.96 * deviation, 1e-9), 1 - 1e-9)
+    high = min(max(score + 1.96 * deviation, 1e-9), 1 - 1e-9)
+    return elo(score), (elo(high) - elo(low)) / 2
+
+
+def sprt(
+    wins: int,
+    losses: int,
+    draws: int,
+    elo0: float,
+    elo1: float,
+    alpha: float,
+    beta: float,
+) -> Tuple[float, float, float, Optional[bool]]:
+    """
+    Sequential probability ratio test of the hypothesis that the Elo difference
+    is elo1 rather than elo0, with the normal approximation of the results.
+    Return the log likelihood ratio, its bounds, and True when the test passed,
+    False when it failed, or None when more games are needed.
+    """
+    lower = log(beta / (1 - alpha))
+    upper = log((1 - beta) / alpha)
+
+    games = wins + losses + draws
+    (_, variance) = score_statistics(wins, losses, draws)
+    if not variance:
+        return 0.0, lower, upper, None
+
+    def expected_score(elo: float) -> float:
+        return 1 / (1 + 10 ** (-elo / 400))
+
+    (score0, score1) = (expected_score(elo0), expected_score(elo1))
+    total = wins + draws / 2
+    llr = (score1 - score0) * (2 * total - games * (score0 + score1)) / (2 * variance)
+
+    if llr >= upper:
+        return llr, lower, upper, True
+    if llr <= lower:
+        return llr, lower, upper, False
+    return llr, lower, upper, None
+
+
+def main():
+    parser = ArgumentParser(description="Play a match between two engines.")
+    parser.add_argument("--games", type=int, default=24, help="number of games")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="number of games played at once"
+    )
+    parser.add_argument("--time", type=float, help="time in seconds per move")
+    parser.add_argument("--nodes", type=int, help="nodes per move")
+    parser.add_argument("--depth", type=int, help="maximum depth per move")
+    parser.add_argument("--engine-a", default="", help="options of the first engine")
+    parser.add_argument("--engine-b", default="", help="options of the second engine")
+    parser.add_argument(
+        "--openings", help="file with an opening per line, in long algebraic notation"
+    )
+    parser.add_argument("--pgn", help="file to write the games to")
+    parser.add_argument(
+        "--max-plies",
+        type=int,
+        default=MAX_PLIES,
+        help="plies after which a game is a draw",
+    )
+    parser.add_argument(
+        "--sprt", action="store_true", help="stop once the SPRT is decided"
+    )
+    parser.add_argument("--elo0", type=float, default=0, help="Elo of H0")
+    parser.add_argument("--elo1", type=float, default=10, help="Elo of H1")
+    parser.add_argument("--alpha", type=float, default=0.05, help="type I error")
+    parser.add_argument("--beta", type=float, default=0.05, help="type II error")
+    args = parser.parse_args()
+
+    # The limits of the search are common to both engines.
+    limits = []
+    if args.time is not None:
+        limits.append(f"time_limit={args.time}")
+    if args.nodes is not None:
+        limits.append(f"node_limit={args.nodes}")
+    if args.depth is not None:
+        limits.append(f"depth={args.depth}")
+    if not limits:
+        limits.append("node_limit=2000")
+    engines = [
+        ",".join(limits + [args.engine_a] if args.engine_a else limits),
+        ",".join(limits + [args.engine_b] if args.engine_b else limits),
+    ]
+
+    openings = OPENINGS
+    if args.openings:
+        with open(args.openings) as file:
+            openings = [line.strip() for line in file if line.strip()]
+
+    # Each opening is played twice, with the engines swapping their colors.
+    games = []
+    for index in range(args.games):
+        opening = openings[index // 2 % len(openings)]
+        swap = index % 2
+        games.append((index + 1, opening, engines[swap], engines[1 - swap], swap))
+
+    (wins, losses, draws) = (0, 0, 0)
+    pgn = open(args.pgn, "w") if args.pgn else None
+    with ProcessPoolExecutor(args.workers) as executor:
+        futures = {
+            executor.submit(
+                play_game, opening, white, black, args.max_plies, swap
+            ): (
+                number,
+                white,
+                black,
+                swap,
+            )
+            for (number, opening, white, black, swap) in games
+        }
+        for future in as_completed(futures):
+            (number, white, black, swap) = futures[future]
+            (result, termination, sans) = future.result()
+
+            # Results are counted for the first engine.
+            if result == DRAW:
+                draws += 1
+            elif (result == WHITE_WINS) == (swap == 0):
+                wins += 1
+            else:
+                losses += 1
+
+            if pgn:
+                pgn.write(format_pgn(number, white, black, result, termination, sans))
+                pgn.flush()
+
+            (elo, margin) = elo_difference(wins, losses, draws)
+            line = (
+                f"Game {number:>4}: {result:>7} ({termination}), "
+                f"+{wins} -{losses} ={draws}, Elo {elo:+.1f} +/- {margin:.1f}"
+            )
+            if args.sprt:
+                (llr, lower, upper, passed) = sprt(
+                    wins, losses, draws, args.elo0, args.elo1, args.alpha, args.beta
+                )
+                line += f", LLR {llr:.2f} ({lower:.2f}, {upper:.2f})"
+            print(line)
+
+            if args.sprt and passed is not None:
+                print(f"SPRT {'passed' if passed else 'failed'}")
+                for other in futures:
+                    other.cancel()
+                break
+
+    if pgn:
+        pgn.close()
+
+    (elo, margin) = elo_difference(wins, losses, draws)
+    print(f"\nScore of A vs B: +{wins} -{losses} ={draws}")
+    print(f"Elo difference: {elo:+.1f} +/- {margin:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Perft, the count of the leaf nodes of the move tree to a given depth, used to
+verify and measure the move generation.
+More information here: https://www.chessprogramming.org/Perft
+
+The game has no castling, en passant or promotion, so the counts only match the
+published ones while none of these moves can happen. The expected counts of the
+other positions were verified with a separate, naive move generator.
+
+Usage: python perft.py [--position NAME | --fen FEN] [--depth DEPTH] [--divide]
+                       [--workers WORKERS] [--generator {board,movegen}]
+"""
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Dict, List
+
+from engine.fen import parse_fen
+from engine.movegen import legal_moves
+from engine.position import Position, square_of, square_name
+from engine.utils import enemy_color
+
+# Positions to count, with their expected number of nodes at each depth from 1.
+POSITIONS = {
+    "initial": (
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w",
+        [20, 400, 8902, 197281],
+    ),
+    # Position 3 of the Chess Programming Wiki, from depth 3 its published counts
+    # (2812, 43238) include en passant captures.
+    "endgame": (
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w",
+        [14, 191, 2810, 43087],
+    ),
+    "middlegame": (
+        "r2q1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2Q1RK1 w",
+        [42, 1440, 58937],
+    ),
+    "black": (
+        "4k3/1pp2ppp/p1n5/4p3/2B1P1b1/2N5/PPP2PPP/4K2R b",
+        [29, 830, 21429],
+    ),
+}
+
+
+def perft_movegen(grid: Position, color: str, depth: int) -> int:
+    """
+    Count the leaf nodes with the move generator used by the search
+    """
+    moves = legal_moves(grid, color)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for (start, end) in moves:
+        undo = grid.make_move(start, end)
+        nodes += perft_movegen(grid, enemy_color(color), depth - 1)
+        grid.unmake_move(undo)
+    return nodes
+
+
+def perft_board(grid: Position, color: str, depth: int) -> int:
+    """
+    Count the leaf nodes with the moves of the board, the ones shown to the player
+    """
+    board = _get_board()
+    moves = board.filter_illegal_moves(
+        board.get_color_all_moves(color, grid), color, grid
+    )
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for ((x1, y1), (x2, y2)) in moves:
+        undo = grid.make_move(square_of(x1, y1), square_of(x2, y2))
+        nodes += perft_board(grid, enemy_color(color), depth - 1)
+        grid.unmake_move(undo)
+    return nodes
+
+
+GENERATORS = {"board": perft_board, "movegen": perft_movegen}
+
+# Board used to generate the moves, created once per process
+_board = None
+
+
+def _get_board():
+    global _board
+    if _board is None:
+        # Imported here, so the movegen generator doesn't need the board.
+        from board import Board
+
+        _board = Board(None, 8, 8, 0)
+    return _board
+
+
+def perft(grid: Position, color: str, depth: int, generator: str = "board") -> int:
+    if depth == 0:
+        return 1
+    return GENERATORS[generator](grid, color, depth)
+
+
+def _divide_move(grid: Position, color: str, depth: int, generator: str, move):
+    """
+    Count the leaf nodes after the move, in a worker process
+    """
+    grid.make_move(*move)
+    return perft(grid, enemy_color(color), depth - 1, generator)
+
+
+def divide(
+    grid: Position, color: str, depth: int, generator: str = "board", workers: int = 1
+) -> Dict[str, int]:
+    """
+    Count the leaf nodes after each root move, with the subtrees of the moves
+    spread over the given number of processes
+    """
+    moves = sorted(legal_moves(grid, color))
+    names = [square_name(start) + square_name(end) for (start, end) in moves]
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            counts = list(
+                executor.map(
+                    _divide_move,
+                    *zip(*[(grid, color, depth, generator, move) for move in moves]),
+                )
+            )
+    else:
+        counts = [
+            _divide_move(grid.copy(), color, depth, generator, move) for move in moves
+        ]
+
+    return dict(zip(names, counts))
+
+
+def run_suite(
+    positions: List[str], max_depth: int, generator: str, workers: int
+) -> bool:
+    """
+    Count the nodes of the positions, and compare them with their expected counts.
+    Return whether all of them matched.
+    """
+    success = True
+    for name in positions:
+        (fen, expected) = POSITIONS[name]
+        for depth in range(1, min(max_depth, len(expected)) + 1):
+            (grid, color) = parse_fen(fen)
+            start = perf_counter()
+            nodes = sum(divide(grid, color, depth, generator, workers).values())
+            elapsed = perf_counter() - start
+
+            result = "ok" if nodes == expected[depth - 1] else "FAILED"
+            if result != "ok":
+                success = False
+            print(
+                f"{name:>12} depth {depth}: {nodes:>9} nodes "
+                f"(expected {expected[depth - 1]:>9}), {elapsed:8.3f}s, "
+                f"{nodes / elapsed if elapsed else 0:>9.0f} nodes/s  {result}"
+            )
+    return success
+
+
+def main():
+    parser = ArgumentParser(description="Count the nodes of the move tree.")
+    parser.add_argument(
+        "--position", choices=POSITIONS, help="standard position to count"
+    )
+    parser.add_argument("--fen", help="position to count, in the FEN notation")
+    parser.add_argument("--depth", type=int, default=3, help="maximum depth")
+    parser.add_argument(
+        "--divide",
+        action="store_true",
+        help="show the count of each root move, without checking it",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="number of processes counting"
+    )
+    parser.add_argument(
+        "--generator",
+        choices=GENERATORS,
+        default="board",
+        help="moves of the board, or of the move generator of the search",
+    )
+    args = parser.parse_args()
+
+    if args.divide or args.fen:
+        fen = args.fen or POSITIONS[args.position or "initial"][0]
+        (grid, color) = parse_fen(fen)
+        start = perf_counter()
+        counts = divide(grid, color, args.depth, args.generator, args.workers)
+        elapsed = perf_counter() - start
+
+        for (move, nodes) in counts.items():
+            print(f"{move}: {nodes}")
+        total = sum(counts.values())
+        print(f"\nNodes: {total}\nTime: {elapsed:.3f}s")
+        print(f"Nodes/s: {total / elapsed if elapsed else 0:.0f}")
+        return
+
+    positions = [args.position] if args.position else list(POSITIONS)
+    if not run_suite(positions, args.depth, args.generator, args.workers):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Profiling mode of the game, to find where the time of the search and of the
+rendering goes without changing the code.
+
+It is enabled with the --profile DIRECTORY option of main.py and bench.py, or the
+PY_CHESS_PROFILE environment variable (for uci.py too). The wrapped methods,
+Bot.play and Board.render, are profiled each time they are called, and after each
+move of the bot, the reports of the move are written to the directory:
+
+- MOVE-play.txt and MOVE-render.txt: the top functions, by own and total time
+- MOVE-play.folded: the collapsed stacks, ready for flamegraph.pl or speedscope
+  (sampling mode only)
+- MOVE-play.prof and MOVE-render.prof: the raw statistics, for pstats or snakeviz
+  (cProfile mode only for the search)
+
+The default sampling mode looks at the stack of the profiled thread every
+millisecond, or as often as the GIL lets it (the reports give the measured
+interval), which barely slows the search down. The renders take less than a
+millisecond, too short to ever be sampled, so they are always profiled with
+cProfile. The cProfile mode counts every call of the search exactly too, but makes
+it a few times slower. With --profile-memory (or
+PY_CHESS_PROFILE_MEMORY=1), the allocations of the search are traced with
+tracemalloc too, and their top lines are added to the report of the move.
+"""
+import atexit
+import cProfile
+import os
+import pstats
+import sys
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from collections import Counter
+from functools import wraps
+from threading import Event, Lock, Thread, get_ident
+from time import perf_counter
+from typing import Dict, Optional
+
+# Environment variables enabling the profiling mode without the command line
+PROFILE_ENV = "PY_CHESS_PROFILE"
+PROFILE_MODE_ENV = "PY_CHESS_PROFILE_MODE"
+PROFILE_MEMORY_ENV = "PY_CHESS_PROFILE_MEMORY"
+
+MODES = ("sample", "cprofile")
+# Time in seconds between two samples of the stack
+SAMPLE_INTERVAL = 0.001
+# Number of functions, and of allocating lines, in each report
+TOP_COUNT = 25
+# Frames kept by tracemalloc for each allocation
+TRACEMALLOC_FRAMES = 10
+
+
+def frame_name(frame) -> str:
+    """
+    Return the name of the function of the frame, like "bot.py:negamax"
+    """
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Sampling profiler, counting the stacks of one thread seen at regular intervals
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        # Number of samples of each stack, from the outermost function
+        self.stacks: Counter = Counter()
+        # Time in seconds spent sampling, to measure the real interval
+        self.elapsed = 0.0
+        self.start_time = 0.0
+        self.thread = None
+        self.stop_event = Event()
+
+    def start(self, thread_id: int):
+        self.stop_event.clear()
+        self.start_time = perf_counter()
+        self.thread = Thread(target=self.run, args=(thread_id,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.elapsed += perf_counter() - self.start_time
+        self.thread.join()
+        self.thread = None
+
+    def run(self, thread_id: int):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            # Once stopped, the profiled thread is only waiting for this one.
+            if self.stop_event.is_set():
+                break
+            names = []
+            while frame is not None:
+                names.append(frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def write_folded(self, path: str):
+        """
+        Write the stacks in the collapsed format, one "outer;...;inner count" per line
+        """
+        with open(path, "w") as file:
+            for (stack, count) in Counter(dict(self.stacks)).most_common():
+                file.write(f"{stack} {count}\n")
+
+    def report(self, top: int) -> str:
+        """
+        Return the functions with the most samples, on their own and in total
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        # The stacks are copied at once, a call may still be sampled.
+        stacks = dict(self.stacks)
+        for (stack, count) in stacks.items():
+            names = stack.split(";")
+            own[names[-1]] += count
+            # Recursive functions are counted once per sample.
+            for name in set(names):
+                total[name] += count
+
+        samples = sum(stacks.values())
+        # The sampling thread needs the GIL, so it wakes up less often than asked.
+        interval = self.elapsed / samples if samples else 0
+        lines = [
+            f"{samples} samples in {self.elapsed:.3f} seconds, one every "
+            f"{interval * 1000:.2f} ms ({self.interval * 1000:g} ms requested)"
+        ]
+        for (title, counter) in (("own", own), ("total", total)):
+            lines.append(f"\nTop functions by {title} samples:")
+            for (name, count) in counter.most_common(top):
+                lines.append(f"{count:>8} {count / samples:>7.1%}  {name}")
+        return "\n".join(lines)
+
+
+class Profiler:
+    """
+    Profile methods of objects, and write their reports to a directory after each
+    move of the bot
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        mode: str = "sample",
+        memory: bool = False,
+        top: int = TOP_COUNT,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"unknown profiling mode {mode!r}")
+        self.directory = directory
+        self.mode = mode
+        self.memory = memory
+        self.top = top
+        os.makedirs(directory, exist_ok=True)
+
+        # Number of moves reported, the reports are named after it.
+        self.moves = 0
+        # Profile of each label since the last report, and the time spent in it
+        self.profiles: Dict[str, object] = {}
+        self.times: Counter = Counter()
+        self.calls: Counter = Counter()
+        # Memory report of the labels traced with tracemalloc
+        self.memory_reports: Dict[str, str] = {}
+        # The search and the rendering run in different threads.
+        self.lock = Lock()
+
+        # The calls since the last move are reported when the program ends.
+        atexit.register(self.report)
+
+    def new_profile(self, short_calls: bool):
+        if self.mode == "sample" and not short_calls:
+            return StackSampler()
+        return cProfile.Profile()
+
+    def wrap(
+        self,
+        owner,
+        name: str,
+        label: str,
+        ends_move: bool = False,
+        short_calls: bool = False,
+    ):
+        """
+        Replace the method of the object by a profiled one, reporting the calls of
+        all the labels after each call if it ends a move.
+        The short calls are always profiled with cProfile, as sampling misses them.
+        """
+        method = getattr(owner, name)
+
+        @wraps(method)
+        def profiled(*args, **kwargs):
+            with self.lock:
+                profile = self.profiles.get(label)
+                if profile is None:
+                    profile = self.profiles[label] = self.new_profile(short_calls)
+            if ends_move and self.memory:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                before = tracemalloc.take_snapshot()
+
+            start = perf_counter()
+            started = self.start_profile(profile)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if started:
+                    self.stop_profile(profile)
+                with self.lock:
+                    self.times[label] += perf_counter() - start
+                    self.calls[label] += 1
+
+                if ends_move and self.memory:
+                    self.memory_reports[label] = self.compare_snapshots(before)
+                    tracemalloc.stop()
+                if ends_move:
+                    self.report()
+
+        setattr(owner, name, profiled)
+
+    def start_profile(self, profile) -> bool:
+        """
+        Start profiling the current thread, and return whether it could be
+        """
+        if isinstance(profile, StackSampler):
+            profile.start(get_ident())
+            return True
+        try:
+            profile.enable()
+        except ValueError:
+            # Since Python 3.12, a single cProfile can run at once: the rendering
+            # during a search of the bot isn't profiled.
+            return False
+        return True
+
+    def stop_profile(self, profile):
+        if isinstance(profile, StackSampler):
+            profile.stop()
+        else:
+            profile.disable()
+
+    def compare_snapshots(self, before) -> str:
+        """
+        Return the lines allocating the most memory since the snapshot,
+        and the peak of the traced memory
+        """
+        after = tracemalloc.take_snapshot()
+        (current, peak) = tracemalloc.get_traced_memory()
+        lines = [f"Traced memory: {current} bytes, peak {peak} bytes"]
+        lines.append("\nTop lines by allocated memory:")
+        for difference in after.compare_to(before, "lineno")[: self.top]:
+            lines.append(str(difference))
+        return "\n".join(lines)
+
+    def report(self):
+        """
+        Write the reports of the calls since the last one, and start new profiles
+        """
+        # The calls still running go on with the profiles of the previous move.
+        with self.lock:
+            (profiles, self.profiles) = (self.profiles, {})
+            (times, self.times) = (self.times, Counter())
+            (calls, self.calls) = (self.calls, Counter())
+            (memory_reports, self.memory_reports) = (self.memory_reports, {})
+            if not profiles:
+                return
+            self.moves += 1
+            move = self.moves
+
+        for (label, profile) in profiles.items():
+            prefix = os.path.join(self.directory, f"{move:04d}-{label}")
+            header = f"{label}: {calls[label]} calls, {times[label]:.3f} seconds\n\n"
+            with open(prefix + ".txt", "w") as file:
+                file.write(header)
+                if isinstance(profile, StackSampler):
+                    file.write(profile.report(self.top) + "\n")
+                    profile.write_folded(prefix + ".folded")
+                else:
+                    profile.dump_stats(prefix + ".prof")
+                    stats = pstats.Stats(profile, stream=file)
+                    for order in ("tottime", "cumulative"):
+                        stats.sort_stats(order).print_stats(self.top)
+                if label in memory_reports:
+                    file.write("\n" + memory_reports[label] + "\n")
+
+
+def profile_game(profiler: Profiler, board):
+    """
+    Profile the search of the bot of the board, and the rendering of the board
+    """
+    profiler.wrap(board.bot, "play", "play", ends_move=True)
+    profiler.wrap(board, "render", "render", short_calls=True)
+
+
+def add_profile_arguments(parser: ArgumentParser):
+    """
+    Add the options of the profiling mode to the parser, with the environment
+    variables as defaults
+    """
+    parser.add_argument(
+        "--profile",
+        metavar="DIRECTORY",
+        default=os.environ.get(PROFILE_ENV),
+        help="profile the search and write the reports of each move to the directory",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=MODES,
+        default=os.environ.get(PROFILE_MODE_ENV, "sample"),
+        help="sample the stacks (default), or count every call with cProfile",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        default=os.environ.get(PROFILE_MEMORY_ENV, "") not in ("", "0"),
+        help="trace the memory allocations of the search too (slower)",
+    )
+
+
+def profiler_from_arguments(args: Namespace) -> Optional[Profiler]:
+    """
+    Return the profiler configured by the options, if it is enabled
+    """
+    if not args.profile:
+        return None
+    return Profiler(args.profile, args.profile_mode, args.profile_memory)
+
+
+def profiler_from_environment() -> Optional[Profiler]:
+    """
+    Return the profiler configured by the environment variables, if it is enabled
+    """
+    parser = ArgumentParser()
+    add_profile_arguments(parser)
+    return profiler_from_arguments(parser.parse_args([]))
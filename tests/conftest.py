@@ -0,0 +1,7 @@
+"""
+The tests import the modules of the game from the root of the repository.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
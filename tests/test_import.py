@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+# Maximum time in seconds to import the engine in a new interpreter
+IMPORT_TIME_BUDGET = 0.25
+# Number of imports timed, the fastest one is kept
+IMPORT_REPEAT = 5
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code: str) -> str:
+    """
+    Run the code in a new interpreter from the root of the repository,
+    and return its output
+    """
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def test_import_time():
+    code = (
+        "import time; start = time.perf_counter(); import engine; "
+        "print(time.perf_counter() - start)"
+    )
+    # The fastest import is the least disturbed by the rest of the system.
+    best = min(float(run_python(code)) for _ in range(IMPORT_REPEAT))
+    assert best <= IMPORT_TIME_BUDGET, f"importing the engine took {best:.3f}s"
+
+
+def test_import_without_tkinter():
+    code = "import sys; import engine; print('tkinter' in sys.modules)"
+    assert run_python(code).strip() == "False", "the engine imports tkinter"
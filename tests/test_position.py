@@ -0,0 +1,65 @@
+from random import Random
+
+import pytest
+
+from engine.fen import INITIAL_FEN, parse_fen
+from engine.movegen import legal_moves
+from engine.position import Position, ZOBRIST_PIECES
+from engine.utils import calculate_total_score, enemy_color
+
+# Number of plies of each random game
+GAME_PLIES = 100
+
+
+def full_key(grid: Position) -> int:
+    """
+    Compute the Zobrist key of the grid from scratch
+    """
+    key = 0
+    for (square, code) in enumerate(grid.squares):
+        if code:
+            key ^= ZOBRIST_PIECES[code][square]
+    return key
+
+
+def check_grid(grid: Position):
+    """
+    Verify that everything updated incrementally by the grid matches a full recompute
+    """
+    rebuilt = Position()
+    for (square, code) in enumerate(grid.squares):
+        if code:
+            rebuilt.put(square, code)
+
+    assert grid.score == calculate_total_score(grid), "score mismatch"
+    assert grid.key == full_key(grid), "key mismatch"
+    assert grid.pieces == rebuilt.pieces, "piece lists mismatch"
+    assert grid.occupied == rebuilt.occupied, "occupancy mismatch"
+    assert grid.bitboards == rebuilt.bitboards, "bitboards mismatch"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_state(seed):
+    """
+    Play a random game, and verify after each move and each undo that the
+    state updated incrementally by the grid matches a full recompute
+    """
+    (initial, color) = parse_fen(INITIAL_FEN)
+    grid = initial.copy()
+    rng = Random(seed)
+    undos = []
+
+    for _ in range(GAME_PLIES):
+        moves = legal_moves(grid, color)
+        if not moves:
+            break
+        (start, end) = rng.choice(sorted(moves))
+        undos.append(grid.make_move(start, end))
+        color = enemy_color(color)
+        check_grid(grid)
+
+    while undos:
+        grid.unmake_move(undos.pop())
+        check_grid(grid)
+
+    assert grid == initial, "the grid wasn't restored"
@@ -0,0 +1,39 @@
+import board as board_module
+from board import Board
+from profiling import Profiler, profile_game
+
+
+class StubCanvas:
+    """
+    Canvas drawing nothing, so the board can be rendered without a display
+    """
+
+    def __init__(self):
+        self.items = 0
+
+    def create_item(self, *args, **kwargs) -> int:
+        self.items += 1
+        return self.items
+
+    create_rectangle = create_image = create_item
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def test_profiled_render_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(board_module, "piece_image", lambda piece, size: None)
+    board = Board(None, 8, 8, 10)
+    board.canvas = StubCanvas()
+    profile_game(Profiler(str(tmp_path)), board)
+
+    for _ in range(20):
+        board.render()
+    # The first move of the bot writes the reports of the renders before it.
+    board.bot.depth = 1
+    board.bot.play("white", board.grid)
+
+    report = (tmp_path / "0001-render.txt").read_text()
+    assert report.startswith("render: 20 calls")
+    assert "board.py" in report and "(render)" in report
+    assert "(create_item)" in report
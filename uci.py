@@ -0,0 +1,286 @@
+"""
+Universal Chess Interface front-end, to use the bot from other chess programs.
+More information here: https://www.chessprogramming.org/UCI
+
+The commands are read from the standard input, while the search runs in its own
+thread, so a "stop" is handled as soon as it is received.
+
+The search can be profiled by setting the PY_CHESS_PROFILE environment variable
+to a directory, see profiling.py.
+
+Usage: python uci.py
+"""
+import sys
+from threading import Lock, Thread, Event
+from time import perf_counter
+from traceback import print_exc
+from typing import List
+
+from consts import BOT_MAX_DEPTH
+from engine.book import OpeningBook
+from engine.bot import Bot, mate_plies
+from engine.fen import INITIAL_FEN, parse_fen
+from engine.movegen import legal_moves
+from engine.position import Position, parse_square, square_of, square_name
+from engine.tablebase import Tablebases
+from engine.utils import enemy_color
+from profiling import profiler_from_environment
+
+NAME = "py-chess-tk"
+AUTHOR = "TriForMine"
+
+# Limits of the options
+HASH_DEFAULT, HASH_MIN, HASH_MAX = 16, 1, 1024
+THREADS_DEFAULT, THREADS_MIN, THREADS_MAX = 1, 1, 64
+
+# Part of the remaining time used for a move, when the number of moves
+# until the next time control isn't given.
+MOVES_TO_GO = 30
+# Time in seconds kept to send the move, never spent on the search
+MOVE_OVERHEAD = 0.05
+
+
+def move_name(move) -> str:
+    """
+    Return the move ((x, y), (x, y)) in the long algebraic notation, like "e2e4"
+    """
+    (s, e) = move
+    return square_name(square_of(*s)) + square_name(square_of(*e))
+
+
+class UCIEngine:
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        # Lines are written from both the input loop and the search thread.
+        self.output_lock = Lock()
+
+        self.bot = Bot(None, BOT_MAX_DEPTH, HASH_DEFAULT)
+        self.grid, self.color = parse_fen(INITIAL_FEN)
+
+        self.search_thread = None
+        self.search_stop = Event()
+        self.search_start = 0.0
+
+    def send(self, line: str):
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, lines=sys.stdin):
+        """
+        Handle the commands until "quit" or the end of the input
+        """
+        for line in lines:
+            if not self.handle(line):
+                break
+        self.stop()
+        self.bot.close()
+
+    def handle(self, line: str) -> bool:
+        """
+        Handle a command, return False to quit
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+
+        (command, args) = (tokens[0], tokens[1:])
+        if command == "uci":
+            self.send(f"id name {NAME}")
+            self.send(f"id author {AUTHOR}")
+            self.send(
+                f"option name Hash type spin default {HASH_DEFAULT} "
+                f"min {HASH_MIN} max {HASH_MAX}"
+            )
+            self.send(
+                f"option name Threads type spin default {THREADS_DEFAULT} "
+                f"min {THREADS_MIN} max {THREADS_MAX}"
+            )
+            self.send("option name BookFile type string default <empty>")
+            self.send("option name TablebasePath type string default <empty>")
+            self.send("option name StatsLog type string default <empty>")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.stop()
+            self.bot.tt.clear()
+        elif command == "setoption":
+            self.stop()
+            self.set_option(args)
+        elif command == "position":
+            self.stop()
+            self.set_position(args)
+        elif command == "go":
+            self.stop()
+            self.go(args)
+        elif command == "stop":
+            self.stop()
+        elif command == "quit":
+            return False
+        # Unknown commands are ignored, as the protocol asks.
+        return True
+
+    def set_option(self, args: List[str]):
+        """
+        Handle "setoption name <name> value <value>"
+        """
+        if "name" not in args or "value" not in args:
+            return
+        name = " ".join(args[args.index("name") + 1 : args.index("value")]).lower()
+        value = " ".join(args[args.index("value") + 1 :])
+
+        if name in ("hash", "threads"):
+            try:
+                number = int(value)
+            except ValueError:
+                self.send(f"info string invalid value for {name}: {value}")
+                return
+            if name == "hash":
+                self.bot.set_hash_size(min(max(number, HASH_MIN), HASH_MAX))
+            else:
+                self.bot.set_workers(min(max(number, THREADS_MIN), THREADS_MAX))
+        elif name == "bookfile":
+            if self.bot.book:
+                self.bot.book.close()
+            self.bot.book = None
+            if value and value != "<empty>":
+                try:
+                    self.bot.book = OpeningBook(value)
+                except OSError as error:
+                    self.send(f"info string cannot open the book: {error}")
+        elif name == "tablebasepath":
+            if self.bot.tablebases:
+                self.bot.tablebases.close()
+            self.bot.tablebases = None
+            if value and value != "<empty>":
+                self.bot.tablebases = Tablebases(value)
+        elif name == "statslog":
+            self.bot.stats_log = value if value and value != "<empty>" else None
+
+    def set_position(self, args: List[str]):
+        """
+        Handle "position [startpos | fen <fen>] [moves <move> ...]"
+        """
+        moves = []
+        if "moves" in args:
+            moves = args[args.index("moves") + 1 :]
+            args = args[: args.index("moves")]
+
+        if args and args[0] == "fen":
+            try:
+                (self.grid, self.color) = parse_fen(" ".join(args[1:]))
+            except ValueError as error:
+                # The previous position is kept.
+                self.send(f"info string {error}")
+                return
+        else:
+            (self.grid, self.color) = parse_fen(INITIAL_FEN)
+
+        for move in moves:
+            # The promotion piece, if any, is ignored as pawns aren't promoted.
+            try:
+                (start, end) = (parse_square(move[:2]), parse_square(move[2:4]))
+            except (ValueError, IndexError):
+                (start, end) = (None, None)
+            if (start, end) not in legal_moves(self.grid, self.color):
+                # The moves are applied up to the last valid one.
+                self.send(f"info string illegal move {move}")
+                return
+            self.grid.make_move(start, end)
+            self.color = enemy_color(self.color)
+
+    def go(self, args: List[str]):
+        """
+        Handle "go" with its limits, and start the search
+        """
+        limits = {}
+        for (name, value) in zip(args, args[1:]):
+            if value.lstrip("-").isdigit():
+                limits[name] = int(value)
+        infinite = "infinite" in args or "ponder" in args
+
+        self.bot.depth = limits.get("depth", BOT_MAX_DEPTH)
+        self.bot.node_limit = limits.get("nodes")
+        self.bot.time_limit = None
+        if "movetime" in limits:
+            self.bot.time_limit = limits["movetime"] / 1000
+        else:
+            remaining = limits.get("wtime" if self.color == "white" else "btime")
+            increment = limits.get("winc" if self.color == "white" else "binc", 0)
+            if remaining is not None:
+                moves_to_go = limits.get("movestogo", MOVES_TO_GO) or MOVES_TO_GO
+                budget = remaining / moves_to_go + increment / 2
+                # Never use more than the time left, minus the overhead to send the move.
+                budget = min(budget, remaining - MOVE_OVERHEAD * 1000)
+                self.bot.time_limit = max(budget / 1000, MOVE_OVERHEAD)
+
+        self.search_stop = Event()
+        self.search_start = perf_counter()
+        self.search_thread = Thread(
+            target=self.search,
+            args=(self.grid.copy(), self.color, self.search_stop, infinite),
+            daemon=True,
+        )
+        self.search_thread.start()
+
+    def search(self, grid: Position, color: str, stop: Event, infinite: bool):
+        """
+        Search the best move, in the search thread
+        """
+        # A bestmove is always sent, or the other program would wait for it forever.
+        move = None
+        try:
+            move = self.bot.play(color, grid, stop, self.send_info)
+
+            # An infinite search only ends when it is asked to.
+            if infinite:
+                stop.wait()
+        except Exception as error:
+            print_exc()
+            self.send(f"info string the search failed: {error!r}")
+        finally:
+            self.send(f"bestmove {move_name(move) if move else '0000'}")
+
+    def send_info(self, depth: int, move, score: float, nodes: int):
+        """
+        Send the result of an iteration of the search
+        """
+        elapsed = perf_counter() - self.search_start
+        # The principal variation of the iteration starts with its best move.
+        pv = " ".join(move_name(pv_move) for pv_move in self.bot.pv) or move_name(move)
+        plies = mate_plies(score)
+        if plies is not None:
+            # The checkmates and the tablebases give the exact plies to the mate.
+            mate = (plies + 1) // 2
+            score_text = f"mate {mate if score > 0 else -mate}"
+        else:
+            # The pawn is worth 10 points in the evaluation, and 100 centipawns.
+            score_text = f"cp {round(score * 10)}"
+        self.send(
+            f"info depth {depth} score {score_text} nodes {nodes} "
+            f"nps {round(nodes / elapsed) if elapsed else 0} "
+            f"time {round(elapsed * 1000)} pv {pv}"
+        )
+
+    def stop(self):
+        """
+        Stop the current search, if any, and wait for its move to be sent
+        """
+        if self.search_thread is None:
+            return
+        self.search_stop.set()
+        self.search_thread.join()
+        self.search_thread = None
+
+
+def main():
+    engine = UCIEngine()
+    profiler = profiler_from_environment()
+    if profiler:
+        profiler.wrap(engine.bot, "play", "play", ends_move=True)
+    engine.run(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()